@@ -11,14 +11,30 @@ import sys
 import json
 import yaml
 import logging
+import logging.handlers
+import atexit
+import inspect
+import subprocess
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Callable, List, Set, Tuple
 import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+# 优先使用 LibYAML 的 C 实现
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
 
 # 数据库连接
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.pooling import MySQLConnectionPool
+from contextlib import contextmanager
 
 # Milvus 连接
 try:
@@ -28,18 +44,76 @@ except ImportError:
     MILVUS_AVAILABLE = False
     logging.warning("PyMilvus 未安装，Milvus 功能不可用")
 
+# Milvus 异步客户端（pymilvus >= 2.5.3），用于批量操作
+try:
+    from pymilvus import AsyncMilvusClient
+    ASYNC_MILVUS_AVAILABLE = True
+except ImportError:
+    ASYNC_MILVUS_AVAILABLE = False
+
 # 本地对象存储（替代MinIO）
 import shutil
 from pathlib import Path
 LOCAL_OBJECT_STORE_AVAILABLE = True
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# 模板 SQL 超过 max_allowed_packet 时，每批发送的语句数
+SCHEMA_STATEMENTS_PER_BATCH = 50
+
+# MySQL 连接池大小（首次需要独立连接时才创建；常驻连接不占用连接池）。
+# 各操作同时只有 MySQL 步骤一个线程使用连接池，超出时在 _mysql() 中排队等待
+MYSQL_POOL_SIZE = 2
+
+# 备份目录名中的时间戳格式
+BACKUP_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+# mysqldump 输出管道的读取块大小
+MYSQLDUMP_CHUNK_SIZE = 1 << 20
+
+# 本地对象存储中每个实验的子目录
+EXPERIMENT_SUBDIRS = ("documents", "images", "metadata")
+
+# 实验文档向量集合的索引参数
+MILVUS_INDEX_PARAMS = {
+    "metric_type": "L2",
+    "index_type": "IVF_FLAT",
+    "params": {"nlist": 128}
+}
+
 logger = logging.getLogger(__name__)
 
+# 命令行日志缓冲（仅 main() 中启用，作为模块导入时不改动 root logger）
+_log_buffer: Optional[logging.handlers.MemoryHandler] = None
+
+def _configure_logging():
+    """配置命令行日志；stderr 被重定向时先缓冲在内存中，遇到 ERROR、等待用户输入或进程退出时批量写出"""
+    global _log_buffer
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        # 已有日志配置时保持不变
+        return
+    
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    root_logger.setLevel(logging.INFO)
+    
+    # 终端上直接输出，保证与 print/input 提示的顺序一致
+    if sys.stderr.isatty():
+        root_logger.addHandler(handler)
+        return
+    
+    _log_buffer = logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.ERROR,
+        target=handler
+    )
+    root_logger.addHandler(_log_buffer)
+    atexit.register(_log_buffer.flush)
+
+def _flush_logs():
+    """写出已缓冲的日志（提示用户输入前调用，保证输出顺序）"""
+    if _log_buffer is not None:
+        _log_buffer.flush()
+
 # 统一配置
 SERVICES_CONFIG = {
     'mysql': {
@@ -61,14 +135,74 @@ SERVICES_CONFIG = {
     }
 }
 
+_EMBED_DIM: Optional[int] = None
+
+def _get_embed_dim() -> int:
+    """从配置获取向量维度（首次调用时导入配置模块并缓存）"""
+    global _EMBED_DIM
+    if _EMBED_DIM is None:
+        from knowledge_rag.config import get_embedding_settings
+        _EMBED_DIM = get_embedding_settings().dimension
+    return _EMBED_DIM
+
+
+def _template_sql(template: str) -> str:
+    """生成模板 SQL（使用共享的模板管理器，模板文件未修改时复用其缓存的 SQL）"""
+    from experiment_schemas import get_manager
+    return get_manager().generate_schema_sql(template) or ""
+
+
+def _copy_file_in_kernel(src: str, dst: Path):
+    """在内核态复制单个文件（copy_file_range），不支持时回退到 shutil.copy2"""
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):
+        # 非 Linux 平台或跨文件系统不支持 copy_file_range
+        shutil.copy2(src, dst)
+
+
+def _fast_tree_copy(src: Path, dst: Path):
+    """复制目录树：优先 reflink（写时复制文件系统上仅复制元数据），失败时逐文件内核态复制"""
+    dst.mkdir(parents=True, exist_ok=True)
+    try:
+        subprocess.run(
+            ['cp', '--reflink=auto', '-a', f"{src}/.", str(dst)],
+            check=True, capture_output=True
+        )
+        return
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    
+    for root, _, files in os.walk(src):
+        target_root = dst / os.path.relpath(root, src)
+        target_root.mkdir(parents=True, exist_ok=True)
+        for name in files:
+            _copy_file_in_kernel(os.path.join(root, name), target_root / name)
+
+
 class UnifiedDataManager:
     """统一数据管理器 - 支持 MySQL + Milvus + 本地对象存储"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.mysql_conn: Optional[mysql.connector.MySQLConnection] = None
+        self._pool: Optional[MySQLConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # 连接池为空时 get_connection() 会直接抛出 PoolError，用信号量让多余的调用方等待
+        self._pool_slots = threading.BoundedSemaphore(MYSQL_POOL_SIZE)
+        self.mysql_conn = None  # 常驻连接，供小查询复用
         self.milvus_conn: Optional[str] = None
+        self._max_allowed_packet: Optional[int] = None
+        self._cursor = None  # 小查询复用的游标，见 _cur()
         self.object_store_base_path: Path = Path(config.get('local_object_store', {}).get('base_path', './data/local_object_store'))
+        # 实验目录路径固定，预先计算避免各操作重复拼接
+        self._experiments_dir: Path = self.object_store_base_path / config.get('local_object_store', {}).get('experiments_dir', 'experiments')
         
         # 服务连接状态
         self.services_status = {
@@ -78,51 +212,78 @@ class UnifiedDataManager:
         }
         
     def connect_all(self) -> Dict[str, bool]:
-        """连接所有服务"""
-        # 连接 MySQL
+        """连接所有服务（三个服务互不依赖，并发初始化）"""
+        connectors = {
+            'mysql': self._connect_mysql,
+            'milvus': self._connect_milvus,
+            'local_object_store': self._init_object_store
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(connectors)) as executor:
+            futures = {service: executor.submit(fn) for service, fn in connectors.items()}
+            for service, future in futures.items():
+                self.services_status[service] = future.result()
+        
+        return self.services_status
+    
+    def _connect_mysql(self) -> bool:
+        """连接 MySQL（启动时只建立一个常驻连接，连接池在 _mysql() 首次使用时创建）"""
         try:
             self.mysql_conn = mysql.connector.connect(**self.config['mysql'])
             if self.mysql_conn.is_connected():
-                self.services_status['mysql'] = True
                 logger.info("✅ MySQL 连接成功")
+                return True
         except Error as e:
             logger.error(f"❌ MySQL 连接失败: {e}")
+        return False
+    
+    def _connect_milvus(self) -> bool:
+        """连接 Milvus"""
+        if not MILVUS_AVAILABLE:
+            return False
         
-        # 连接 Milvus
-        if MILVUS_AVAILABLE:
-            try:
-                connections.connect(
-                    alias=self.config['milvus']['alias'],
-                    host=self.config['milvus']['host'],
-                    port=self.config['milvus']['port']
-                )
-                self.milvus_conn = self.config['milvus']['alias']
-                self.services_status['milvus'] = True
-                logger.info("✅ Milvus 连接成功")
-            except Exception as e:
-                logger.error(f"❌ Milvus 连接失败: {e}")
-        
-        # 初始化本地对象存储
-        if LOCAL_OBJECT_STORE_AVAILABLE:
-            try:
-                # 确保基础目录存在
-                self.object_store_base_path.mkdir(parents=True, exist_ok=True)
-                experiments_dir = self.object_store_base_path / self.config['local_object_store']['experiments_dir']
-                experiments_dir.mkdir(parents=True, exist_ok=True)
-                
-                self.services_status['local_object_store'] = True
-                logger.info("✅ 本地对象存储初始化成功")
-            except Exception as e:
-                logger.error(f"❌ 本地对象存储初始化失败: {e}")
+        try:
+            connections.connect(
+                alias=self.config['milvus']['alias'],
+                host=self.config['milvus']['host'],
+                port=self.config['milvus']['port']
+            )
+            self.milvus_conn = self.config['milvus']['alias']
+            logger.info("✅ Milvus 连接成功")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Milvus 连接失败: {e}")
+            return False
+    
+    def _init_object_store(self) -> bool:
+        """初始化本地对象存储"""
+        if not LOCAL_OBJECT_STORE_AVAILABLE:
+            return False
         
-        return self.services_status
+        try:
+            # 确保基础目录存在
+            self.object_store_base_path.mkdir(parents=True, exist_ok=True)
+            self._experiments_dir.mkdir(parents=True, exist_ok=True)
+            
+            logger.info("✅ 本地对象存储初始化成功")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 本地对象存储初始化失败: {e}")
+            return False
     
     def disconnect_all(self):
         """断开所有连接"""
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+        
         if self.mysql_conn and self.mysql_conn.is_connected():
             self.mysql_conn.close()
             logger.info("MySQL 连接已断开")
         
+        # MySQLConnectionPool 没有公开的关闭接口，释放引用后空闲连接随对象回收关闭
+        self._pool = None
+        
         if self.milvus_conn and MILVUS_AVAILABLE:
             try:
                 connections.disconnect(self.milvus_conn)
@@ -133,25 +294,43 @@ class UnifiedDataManager:
     def create_experiment(self, experiment_name: str, researcher: str = "", 
                          description: str = "", template: str = "basic_rag") -> Dict[str, bool]:
         """创建完整的实验环境"""
+        return self._create_experiment(
+            experiment_name, researcher, description, template,
+            milvus_step=lambda: self._create_milvus_collections(experiment_name)
+        )
+    
+    def create_experiments_bulk(self, experiment_names: List[str], researcher: str = "",
+                                description: str = "", template: str = "basic_rag") -> Dict[str, Dict[str, bool]]:
+        """批量创建实验环境，各实验的 Milvus 集合通过异步客户端并发创建"""
+        milvus_results = self._run_milvus_bulk(self._create_milvus_collections_async, experiment_names)
+        
+        all_results = {}
+        for name in experiment_names:
+            if name in milvus_results:
+                milvus_step = lambda result=milvus_results[name]: result
+            else:
+                milvus_step = lambda name=name: self._create_milvus_collections(name)
+            all_results[name] = self._create_experiment(name, researcher, description, template, milvus_step)
+        
+        return all_results
+    
+    def _create_experiment(self, experiment_name: str, researcher: str, description: str,
+                           template: str, milvus_step: Callable[[], bool]) -> Dict[str, bool]:
+        """创建实验环境（Milvus 步骤由调用方提供）"""
         results = {
             'mysql': False,
             'milvus': False,
             'minio': False
         }
         
-        # 1. 创建 MySQL 数据库
-        if self.services_status['mysql']:
-            results['mysql'] = self._create_mysql_database(experiment_name, template)
-        
-        # 2. 创建 Milvus 集合
-        if self.services_status['milvus']:
-            results['milvus'] = self._create_milvus_collections(experiment_name)
-        
-        # 3. 创建本地对象存储目录
-        if self.services_status['local_object_store']:
-            results['local_object_store'] = self._create_local_object_store_dir(experiment_name)
+        # 1-3. 并发创建 MySQL 数据库、Milvus 集合、本地对象存储目录
+        results.update(self._run_service_steps({
+            'mysql': lambda: self._create_mysql_database(experiment_name, template),
+            'milvus': milvus_step,
+            'local_object_store': lambda: self._create_local_object_store_dir(experiment_name)
+        }))
         
-        # 4. 创建实验配置文件
+        # 4. 创建实验配置文件（依赖上面的结果）
         self._create_experiment_config(experiment_name, researcher, description, results)
         
         return results
@@ -159,28 +338,52 @@ class UnifiedDataManager:
     def delete_experiment(self, experiment_name: str, force: bool = False) -> Dict[str, bool]:
         """删除完整的实验环境"""
         if not force:
+            _flush_logs()
             confirm = input(f"⚠️  确定要删除实验 '{experiment_name}' 的所有数据吗？(y/N): ")
             if confirm.lower() != 'y':
                 logger.info("操作已取消")
                 return {'cancelled': True}
         
+        return self._delete_experiment(
+            experiment_name,
+            milvus_step=lambda: self._delete_milvus_collections(experiment_name)
+        )
+    
+    def delete_experiments_bulk(self, experiment_names: List[str], force: bool = False) -> Dict[str, Dict[str, bool]]:
+        """批量删除实验环境，各实验的 Milvus 集合通过异步客户端并发删除"""
+        if not force:
+            _flush_logs()
+            confirm = input(f"⚠️  确定要删除 {len(experiment_names)} 个实验的所有数据吗？(y/N): ")
+            if confirm.lower() != 'y':
+                logger.info("操作已取消")
+                return {'cancelled': True}
+        
+        milvus_results = self._run_milvus_bulk(self._delete_milvus_collections_async, experiment_names)
+        
+        all_results = {}
+        for name in experiment_names:
+            if name in milvus_results:
+                milvus_step = lambda result=milvus_results[name]: result
+            else:
+                milvus_step = lambda name=name: self._delete_milvus_collections(name)
+            all_results[name] = self._delete_experiment(name, milvus_step)
+        
+        return all_results
+    
+    def _delete_experiment(self, experiment_name: str, milvus_step: Callable[[], bool]) -> Dict[str, bool]:
+        """删除实验环境（Milvus 步骤由调用方提供）"""
         results = {
             'mysql': False,
             'milvus': False,
             'local_object_store': False
         }
         
-        # 1. 删除 MySQL 数据库
-        if self.services_status['mysql']:
-            results['mysql'] = self._delete_mysql_database(experiment_name)
-        
-        # 2. 删除 Milvus 集合
-        if self.services_status['milvus']:
-            results['milvus'] = self._delete_milvus_collections(experiment_name)
-        
-        # 3. 删除本地对象存储目录
-        if self.services_status['local_object_store']:
-            results['local_object_store'] = self._delete_local_object_store_dir(experiment_name)
+        # 1-3. 并发删除 MySQL 数据库、Milvus 集合、本地对象存储目录
+        results.update(self._run_service_steps({
+            'mysql': lambda: self._delete_mysql_database(experiment_name),
+            'milvus': milvus_step,
+            'local_object_store': lambda: self._delete_local_object_store_dir(experiment_name)
+        }))
         
         # 4. 删除实验配置文件
         self._delete_experiment_config(experiment_name)
@@ -194,23 +397,24 @@ class UnifiedDataManager:
         # 从 MySQL 获取实验列表
         if self.services_status['mysql']:
             try:
-                cursor = self.mysql_conn.cursor()
-                cursor.execute("SHOW DATABASES")
+                cursor = self._cur()
+                # 由服务端按前缀过滤（转义 LIKE 中的下划线通配符）
+                cursor.execute("SHOW DATABASES LIKE 'knowledge\\_rag\\_%'")
                 databases = [db[0] for db in cursor.fetchall()]
                 
-                for db in databases:
-                    if db.startswith('knowledge_rag_'):
-                        exp_name = db.replace('knowledge_rag_', '')
-                        exp_info = {
-                            'name': exp_name,
-                            'mysql_db': db,
-                            'mysql_exists': True,
-                            'milvus_exists': self._check_milvus_collections(exp_name),
-                            'local_object_store_exists': self._check_local_object_store_dir(exp_name)
-                        }
-                        experiments.append(exp_info)
-                
-                cursor.close()
+                exp_names = [db[len('knowledge_rag_'):] for db in databases]
+                # 一次性获取全部 Milvus 集合，避免逐个实验调用 has_collection
+                milvus_collections = self._list_milvus_collections()
+                experiments = [
+                    {
+                        'name': exp_name,
+                        'mysql_db': f"knowledge_rag_{exp_name}",
+                        'mysql_exists': True,
+                        'milvus_exists': f"knowledge_rag_{exp_name}_documents" in milvus_collections,
+                        'local_object_store_exists': self._check_local_object_store_dir(exp_name)
+                    }
+                    for exp_name in exp_names
+                ]
             except Error as e:
                 logger.error(f"获取实验列表失败: {e}")
         
@@ -223,10 +427,9 @@ class UnifiedDataManager:
         # MySQL 健康检查
         if self.services_status['mysql']:
             try:
-                cursor = self.mysql_conn.cursor()
+                cursor = self._cur()
                 cursor.execute("SELECT 1")
-                cursor.fetchone()
-                cursor.close()
+                cursor.fetchall()
                 health_status['mysql'] = {
                     'status': 'healthy',
                     'version': self.mysql_conn.get_server_info()
@@ -261,12 +464,15 @@ class UnifiedDataManager:
             try:
                 # 检查基础目录
                 if self.object_store_base_path.exists():
-                    experiments_dir = self.object_store_base_path / self.config['local_object_store']['experiments_dir']
-                    experiment_dirs = list(experiments_dir.glob('*')) if experiments_dir.exists() else []
+                    experiments_count = 0
+                    if self._experiments_dir.exists():
+                        # 只计数，不构造 Path 对象（与 glob('*') 一致，忽略隐藏项）
+                        with os.scandir(self._experiments_dir) as entries:
+                            experiments_count = sum(1 for entry in entries if not entry.name.startswith('.'))
                     health_status['local_object_store'] = {
                         'status': 'healthy',
                         'base_path': str(self.object_store_base_path),
-                        'experiments_count': len(experiment_dirs)
+                        'experiments_count': experiments_count
                     }
                 else:
                     health_status['local_object_store'] = {
@@ -285,7 +491,7 @@ class UnifiedDataManager:
     
     def backup_experiment(self, experiment_name: str, backup_dir: str = "backups") -> Dict[str, bool]:
         """备份实验数据"""
-        backup_path = Path(backup_dir) / f"{experiment_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        backup_path = Path(backup_dir) / f"{experiment_name}_{time.strftime(BACKUP_TIMESTAMP_FORMAT)}"
         backup_path.mkdir(parents=True, exist_ok=True)
         
         results = {
@@ -294,45 +500,73 @@ class UnifiedDataManager:
             'local_object_store': False
         }
         
-        # 1. 备份 MySQL 数据
-        if self.services_status['mysql']:
-            results['mysql'] = self._backup_mysql_data(experiment_name, backup_path)
-        
-        # 2. 备份 Milvus 数据
-        if self.services_status['milvus']:
-            results['milvus'] = self._backup_milvus_data(experiment_name, backup_path)
-        
-        # 3. 备份本地对象存储数据
-        if self.services_status['local_object_store']:
-            results['local_object_store'] = self._backup_local_object_store_data(experiment_name, backup_path)
+        # 1-3. 并发备份 MySQL、Milvus、本地对象存储数据
+        results.update(self._run_service_steps({
+            'mysql': lambda: self._backup_mysql_data(experiment_name, backup_path),
+            'milvus': lambda: self._backup_milvus_data(experiment_name, backup_path),
+            'local_object_store': lambda: self._backup_local_object_store_data(experiment_name, backup_path)
+        }))
         
         logger.info(f"备份完成: {backup_path}")
         return results
     
     # === 私有方法 ===
     
+    @contextmanager
+    def _mysql(self):
+        """从连接池获取连接，用完归还；并发执行的操作各自使用独立连接"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = MySQLConnectionPool(
+                    pool_name='krag',
+                    pool_size=MYSQL_POOL_SIZE,
+                    **self.config['mysql']
+                )
+        with self._pool_slots:
+            conn = self._pool.get_connection()
+            try:
+                yield conn
+            finally:
+                conn.close()
+    
+    def _cur(self):
+        """获取复用的 MySQL 游标，避免小查询反复创建/关闭游标"""
+        if self._cursor is None:
+            self._cursor = self.mysql_conn.cursor()
+        return self._cursor
+    
+    def _run_service_steps(self, steps: Dict[str, Callable[[], bool]]) -> Dict[str, bool]:
+        """并发执行各服务的操作，仅执行已连接服务的步骤"""
+        active_steps = {service: fn for service, fn in steps.items() if self.services_status[service]}
+        if not active_steps:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=len(active_steps)) as executor:
+            futures = {service: executor.submit(fn) for service, fn in active_steps.items()}
+            return {service: future.result() for service, future in futures.items()}
+    
     def _create_mysql_database(self, experiment_name: str, template: str) -> bool:
         """创建 MySQL 数据库"""
         try:
-            cursor = self.mysql_conn.cursor()
             db_name = f"knowledge_rag_{experiment_name}"
             
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name} "
-                          f"CHARACTER SET {self.config['mysql']['charset']} "
-                          f"COLLATE {self.config['mysql']['collation']}")
-            
-            cursor.execute(f"USE {db_name}")
-            
-            # 执行模板 SQL
-            # 这里可以集成 experiment_schemas.py 的模板系统
-            schema_sql = self._get_template_sql(template)
-            if schema_sql:
-                for statement in schema_sql.split(';'):
-                    if statement.strip():
-                        cursor.execute(statement)
+            with self._mysql() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name} "
+                              f"CHARACTER SET {self.config['mysql']['charset']} "
+                              f"COLLATE {self.config['mysql']['collation']}")
+                
+                cursor.execute(f"USE {db_name}")
+                
+                # 执行模板 SQL
+                # 这里可以集成 experiment_schemas.py 的模板系统
+                schema_sql = self._get_template_sql(template)
+                if schema_sql:
+                    self._execute_schema_sql(cursor, schema_sql)
+                
+                conn.commit()
+                cursor.close()
             
-            self.mysql_conn.commit()
-            cursor.close()
             logger.info(f"MySQL 数据库创建成功: {db_name}")
             return True
             
@@ -340,6 +574,35 @@ class UnifiedDataManager:
             logger.error(f"MySQL 数据库创建失败: {e}")
             return False
     
+    def _execute_schema_sql(self, cursor, schema_sql: str):
+        """以多语句方式批量执行模板 SQL，减少客户端与服务端的往返次数"""
+        if self._max_allowed_packet is None:
+            cursor.execute("SELECT @@max_allowed_packet")
+            self._max_allowed_packet = int(cursor.fetchone()[0])
+        
+        if len(schema_sql.encode('utf-8')) < self._max_allowed_packet:
+            batches = [schema_sql]
+        else:
+            # 超过单包上限时按语句分批发送
+            statements = [stmt for stmt in schema_sql.split(';') if stmt.strip()]
+            batches = [
+                ';'.join(statements[i:i + SCHEMA_STATEMENTS_PER_BATCH]) + ';'
+                for i in range(0, len(statements), SCHEMA_STATEMENTS_PER_BATCH)
+            ]
+        
+        # mysql-connector-python 9.2 起 execute() 原生支持多语句，不再接受 multi 参数
+        legacy_multi = 'multi' in inspect.signature(cursor.execute).parameters
+        for batch in batches:
+            if legacy_multi:
+                # multi=True 返回每条语句结果的迭代器，必须消费完
+                for _ in cursor.execute(batch, multi=True):
+                    pass
+            else:
+                # 逐个读取后续语句的结果，读完才能在该连接上执行下一条 SQL
+                cursor.execute(batch)
+                while cursor.nextset():
+                    pass
+    
     def _create_milvus_collections(self, experiment_name: str) -> bool:
         """创建 Milvus 集合"""
         if not MILVUS_AVAILABLE:
@@ -350,10 +613,7 @@ class UnifiedDataManager:
             collection_name = f"knowledge_rag_{experiment_name}_documents"
             
             # 定义字段
-            # 从配置获取向量维度
-            from knowledge_rag.config import get_embedding_settings
-            embedding_settings = get_embedding_settings()
-            vector_dim = embedding_settings.dimension
+            vector_dim = _get_embed_dim()
             
             fields = [
                 FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
@@ -376,14 +636,9 @@ class UnifiedDataManager:
             )
             
             # 创建索引
-            index_params = {
-                "metric_type": "L2",
-                "index_type": "IVF_FLAT",
-                "params": {"nlist": 128}
-            }
             collection.create_index(
                 field_name="embedding",
-                index_params=index_params
+                index_params=MILVUS_INDEX_PARAMS
             )
             
             logger.info(f"Milvus 集合创建成功: {collection_name}")
@@ -393,22 +648,79 @@ class UnifiedDataManager:
             logger.error(f"Milvus 集合创建失败: {e}")
             return False
     
+    def _run_milvus_bulk(self, operation: Callable, experiment_names: List[str]) -> Dict[str, bool]:
+        """用异步客户端并发执行多个实验的 Milvus 操作；异步客户端不可用时返回空字典"""
+        if not ASYNC_MILVUS_AVAILABLE or not self.services_status['milvus']:
+            return {}
+        
+        async def run_all() -> Dict[str, bool]:
+            client = AsyncMilvusClient(
+                uri=f"http://{self.config['milvus']['host']}:{self.config['milvus']['port']}"
+            )
+            try:
+                results = await asyncio.gather(*(operation(client, name) for name in experiment_names))
+            finally:
+                await client.close()
+            return dict(zip(experiment_names, results))
+        
+        try:
+            return asyncio.run(run_all())
+        except Exception as e:
+            logger.warning(f"Milvus 异步批量操作失败，回退到同步方式: {e}")
+            return {}
+    
+    async def _create_milvus_collections_async(self, client, experiment_name: str) -> bool:
+        """创建 Milvus 集合（异步客户端）"""
+        try:
+            collection_name = f"knowledge_rag_{experiment_name}_documents"
+            
+            schema = AsyncMilvusClient.create_schema(
+                auto_id=True,
+                description=f"Document embeddings for experiment {experiment_name}"
+            )
+            schema.add_field("id", DataType.INT64, is_primary=True)
+            schema.add_field("document_id", DataType.INT64)
+            schema.add_field("chunk_id", DataType.INT64)
+            schema.add_field("embedding", DataType.FLOAT_VECTOR, dim=_get_embed_dim())
+            schema.add_field("text", DataType.VARCHAR, max_length=2000)
+            await client.create_collection(collection_name, schema=schema)
+            
+            index_params = AsyncMilvusClient.prepare_index_params()
+            index_params.add_index(field_name="embedding", **MILVUS_INDEX_PARAMS)
+            await client.create_index(collection_name, index_params)
+            
+            logger.info(f"Milvus 集合创建成功: {collection_name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Milvus 集合创建失败: {e}")
+            return False
+    
+    async def _delete_milvus_collections_async(self, client, experiment_name: str) -> bool:
+        """删除 Milvus 集合（异步客户端）"""
+        try:
+            collection_name = f"knowledge_rag_{experiment_name}_documents"
+            if await client.has_collection(collection_name):
+                await client.drop_collection(collection_name)
+                logger.info(f"Milvus 集合删除成功: {collection_name}")
+            
+            return True
+        except Exception as e:
+            logger.error(f"Milvus 集合删除失败: {e}")
+            return False
+    
     def _create_local_object_store_dir(self, experiment_name: str) -> bool:
         """创建本地对象存储目录"""
         if not LOCAL_OBJECT_STORE_AVAILABLE:
             return False
         
         try:
-            experiments_dir = self.object_store_base_path / self.config['local_object_store']['experiments_dir']
-            experiment_dir = experiments_dir / experiment_name
-            
-            # 创建实验目录
-            experiment_dir.mkdir(parents=True, exist_ok=True)
+            experiment_dir = self._experiments_dir / experiment_name
             
-            # 创建子目录结构
-            (experiment_dir / "documents").mkdir(exist_ok=True)
-            (experiment_dir / "images").mkdir(exist_ok=True)
-            (experiment_dir / "metadata").mkdir(exist_ok=True)
+            # 直接创建各叶子目录（实验目录作为父目录隐式创建），互不依赖，并发执行
+            leaves = [experiment_dir / subdir for subdir in EXPERIMENT_SUBDIRS]
+            with ThreadPoolExecutor(max_workers=len(leaves)) as executor:
+                list(executor.map(lambda leaf: os.makedirs(leaf, exist_ok=True), leaves))
             
             logger.info(f"本地对象存储目录创建成功: {experiment_dir}")
             return True
@@ -420,10 +732,11 @@ class UnifiedDataManager:
     def _delete_mysql_database(self, experiment_name: str) -> bool:
         """删除 MySQL 数据库"""
         try:
-            cursor = self.mysql_conn.cursor()
             db_name = f"knowledge_rag_{experiment_name}"
-            cursor.execute(f"DROP DATABASE IF EXISTS {db_name}")
-            cursor.close()
+            with self._mysql() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"DROP DATABASE IF EXISTS {db_name}")
+                cursor.close()
             logger.info(f"MySQL 数据库删除成功: {db_name}")
             return True
         except Error as e:
@@ -453,8 +766,7 @@ class UnifiedDataManager:
             return False
         
         try:
-            experiments_dir = self.object_store_base_path / self.config['local_object_store']['experiments_dir']
-            experiment_dir = experiments_dir / experiment_name
+            experiment_dir = self._experiments_dir / experiment_name
             
             if experiment_dir.exists():
                 # 删除整个实验目录
@@ -477,14 +789,23 @@ class UnifiedDataManager:
         except Exception:
             return False
     
+    def _list_milvus_collections(self) -> Set[str]:
+        """获取 Milvus 中所有集合名称"""
+        if not MILVUS_AVAILABLE or not self.services_status['milvus']:
+            return set()
+        
+        try:
+            return set(utility.list_collections(using=self.milvus_conn))
+        except Exception:
+            return set()
+    
     def _check_local_object_store_dir(self, experiment_name: str) -> bool:
         """检查本地对象存储目录是否存在"""
         if not LOCAL_OBJECT_STORE_AVAILABLE or not self.services_status['local_object_store']:
             return False
         
         try:
-            experiments_dir = self.object_store_base_path / self.config['local_object_store']['experiments_dir']
-            experiment_dir = experiments_dir / experiment_name
+            experiment_dir = self._experiments_dir / experiment_name
             return experiment_dir.exists()
         except Exception:
             return False
@@ -492,10 +813,7 @@ class UnifiedDataManager:
     def _get_template_sql(self, template: str) -> str:
         """获取模板 SQL（集成 experiment_schemas.py）"""
         try:
-            # 这里可以集成 experiment_schemas.py 的功能
-            from experiment_schemas import ExperimentSchemaManager
-            schema_manager = ExperimentSchemaManager()
-            return schema_manager.generate_schema_sql(template)
+            return _template_sql(template)
         except Exception as e:
             logger.warning(f"获取模板 SQL 失败: {e}")
             return ""
@@ -507,7 +825,7 @@ class UnifiedDataManager:
             'name': experiment_name,
             'researcher': researcher,
             'description': description,
-            'created_at': datetime.now().isoformat(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
             'services': results,
             'mysql_db': f"knowledge_rag_{experiment_name}",
             'milvus_collection': f"knowledge_rag_{experiment_name}_documents",
@@ -519,7 +837,7 @@ class UnifiedDataManager:
         
         config_file = experiments_dir / f"{experiment_name}.yaml"
         with open(config_file, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+            yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True)
         
         logger.info(f"实验配置文件创建: {config_file}")
     
@@ -533,23 +851,43 @@ class UnifiedDataManager:
     def _backup_mysql_data(self, experiment_name: str, backup_path: Path) -> bool:
         """备份 MySQL 数据"""
         try:
-            import subprocess
-            
             db_name = f"knowledge_rag_{experiment_name}"
             backup_file = backup_path / f"{db_name}.sql"
             
-            # 使用 mysqldump 备份
+            inspected = self._inspect_mysql_tables(db_name)
+            if inspected is None:
+                logger.error(f"MySQL 数据库不存在: {db_name}")
+                return False
+            
+            # 库存在但没有数据时跳过 mysqldump，只写占位文件
+            table_engines, has_data = inspected
+            if not has_data:
+                backup_file.write_text(f"-- {db_name}: 数据库无数据，跳过 mysqldump\n", encoding='utf-8')
+                logger.info(f"MySQL 数据库无数据，已跳过备份: {db_name}")
+                return True
+            
+            # 使用 mysqldump 备份（密码通过环境变量传递，避免出现在进程命令行中）
             cmd = [
                 'mysqldump',
+                '--single-transaction', '--quick', '--compress',
                 '-h', self.config['mysql']['host'],
                 '-P', str(self.config['mysql']['port']),
                 '-u', self.config['mysql']['user'],
-                f'-p{self.config["mysql"]["password"]}',
                 db_name
             ]
+            if all(engine == 'InnoDB' for engine in table_engines.values()):
+                # 全部为 InnoDB 时一致性由 --single-transaction 保证，无需锁表
+                cmd.insert(1, '--skip-lock-tables')
+            env = os.environ.copy()
+            env['MYSQL_PWD'] = self.config['mysql']['password']
             
-            with open(backup_file, 'w') as f:
-                subprocess.run(cmd, stdout=f, check=True)
+            # 以大块从管道流式写入备份文件
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, env=env) as proc, \
+                    open(backup_file, 'wb') as f:
+                shutil.copyfileobj(proc.stdout, f, MYSQLDUMP_CHUNK_SIZE)
+            
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd)
             
             logger.info(f"MySQL 数据备份成功: {backup_file}")
             return True
@@ -558,6 +896,40 @@ class UnifiedDataManager:
             logger.error(f"MySQL 数据备份失败: {e}")
             return False
     
+    def _inspect_mysql_tables(self, db_name: str) -> Optional[Tuple[Dict[str, str], bool]]:
+        """查询库中各表的存储引擎，并判断是否有任意表包含数据；数据库不存在时返回 None"""
+        with self._mysql() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM information_schema.SCHEMATA WHERE SCHEMA_NAME = %s",
+                (db_name,)
+            )
+            if cursor.fetchone() is None:
+                cursor.close()
+                return None
+            
+            cursor.execute(
+                "SELECT TABLE_NAME, ENGINE FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'",
+                (db_name,)
+            )
+            table_engines = dict(cursor.fetchall())
+            
+            has_data = False
+            if table_engines:
+                # information_schema 的 TABLE_ROWS 只是估算值，这里用 EXISTS 精确判断，一次往返
+                db_ident = db_name.replace('`', '``')
+                exists_sql = " OR ".join(
+                    f"EXISTS(SELECT 1 FROM `{db_ident}`.`{table.replace('`', '``')}`)"
+                    for table in table_engines
+                )
+                cursor.execute(f"SELECT {exists_sql}")
+                has_data = bool(cursor.fetchone()[0])
+            
+            cursor.close()
+        
+        return table_engines, has_data
+    
     def _backup_milvus_data(self, experiment_name: str, backup_path: Path) -> bool:
         """备份 Milvus 数据"""
         # Milvus 备份需要特殊处理，这里简化实现
@@ -585,8 +957,7 @@ class UnifiedDataManager:
     def _backup_local_object_store_data(self, experiment_name: str, backup_path: Path) -> bool:
         """备份本地对象存储数据"""
         try:
-            experiments_dir = self.object_store_base_path / self.config['local_object_store']['experiments_dir']
-            experiment_dir = experiments_dir / experiment_name
+            experiment_dir = self._experiments_dir / experiment_name
             
             if not experiment_dir.exists():
                 logger.warning(f"实验目录不存在: {experiment_dir}")
@@ -595,7 +966,7 @@ class UnifiedDataManager:
             backup_dir = backup_path / f"local_object_store_{experiment_name}"
             
             # 复制整个实验目录
-            shutil.copytree(experiment_dir, backup_dir, dirs_exist_ok=True)
+            _fast_tree_copy(experiment_dir, backup_dir)
             
             logger.info(f"本地对象存储数据备份成功: {backup_dir}")
             return True
@@ -605,14 +976,140 @@ class UnifiedDataManager:
             return False
 
 
+def _print_results(title: str, results: Dict[str, bool], ok_text: str = '成功', fail_text: str = '失败'):
+    """打印各服务的操作结果"""
+    print(title)
+    for service, success in results.items():
+        icon = "✅" if success else "❌"
+        print(f"   {icon} {service.upper()}: {ok_text if success else fail_text}")
+
+
+def _experiment_names(args) -> List[str]:
+    """解析 --experiment 参数，多个实验名用逗号分隔"""
+    return [name.strip() for name in args.experiment.split(',') if name.strip()]
+
+
+def _handle_create_exp(manager: UnifiedDataManager, args) -> int:
+    names = _experiment_names(args)
+    if len(names) > 1:
+        # 多个实验走批量接口，Milvus 集合并发创建
+        print(f"\n🚀 批量创建实验: {', '.join(names)}")
+        all_results = manager.create_experiments_bulk(
+            names,
+            args.researcher or "",
+            args.description or "",
+            args.template
+        )
+        for name, results in all_results.items():
+            _print_results(f"📊 {name} 创建结果:", results)
+        return 0
+    
+    print(f"\n🚀 创建实验: {args.experiment}")
+    results = manager.create_experiment(
+        args.experiment,
+        args.researcher or "",
+        args.description or "",
+        args.template
+    )
+    _print_results("📊 创建结果:", results)
+    return 0
+
+
+def _handle_delete_exp(manager: UnifiedDataManager, args) -> int:
+    names = _experiment_names(args)
+    if len(names) > 1:
+        # 多个实验走批量接口，Milvus 集合并发删除
+        print(f"\n🗑️  批量删除实验: {', '.join(names)}")
+        all_results = manager.delete_experiments_bulk(names, args.force)
+        if 'cancelled' in all_results:
+            print("❌ 操作已取消")
+        else:
+            for name, results in all_results.items():
+                _print_results(f"📊 {name} 删除结果:", results)
+        return 0
+    
+    print(f"\n🗑️  删除实验: {args.experiment}")
+    results = manager.delete_experiment(args.experiment, args.force)
+    
+    if 'cancelled' in results:
+        print("❌ 操作已取消")
+    else:
+        _print_results("📊 删除结果:", results)
+    return 0
+
+
+def _handle_list_exp(manager: UnifiedDataManager, args) -> int:
+    print("\n📋 实验列表:")
+    experiments = manager.list_experiments()
+    
+    if not experiments:
+        print("   没有找到实验")
+    else:
+        for exp in experiments:
+            print(f"\n🔬 {exp['name']}")
+            print(f"   MySQL: {'✅' if exp['mysql_exists'] else '❌'}")
+            print(f"   Milvus: {'✅' if exp['milvus_exists'] else '❌'}")
+            print(f"   本地对象存储: {'✅' if exp['local_object_store_exists'] else '❌'}")
+    return 0
+
+
+def _handle_health_check(manager: UnifiedDataManager, args) -> int:
+    print("\n🏥 健康检查:")
+    health = manager.health_check()
+    
+    for service, info in health.items():
+        status = info['status']
+        icon = "✅" if status == 'healthy' else "❌" if status == 'unhealthy' else "⚠️"
+        print(f"   {icon} {service.upper()}: {status}")
+        
+        if 'version' in info:
+            print(f"      版本: {info['version']}")
+        if 'error' in info:
+            print(f"      错误: {info['error']}")
+        if 'experiments_count' in info:
+            print(f"      实验数: {info['experiments_count']}")
+    return 0
+
+
+def _handle_backup_exp(manager: UnifiedDataManager, args) -> int:
+    print(f"\n💾 备份实验: {args.experiment}")
+    results = manager.backup_experiment(args.experiment, args.backup_dir)
+    _print_results("📊 备份结果:", results)
+    return 0
+
+
+def _handle_status(manager: UnifiedDataManager, args) -> int:
+    print("\n📊 系统状态:")
+    print(f"   实验数量: {len(manager.list_experiments())}")
+    
+    health = manager.health_check()
+    healthy_services = sum(1 for info in health.values() if info['status'] == 'healthy')
+    print(f"   健康服务: {healthy_services}/{len(health)}")
+    return 0
+
+
+# 操作类型 -> 处理函数
+HANDLERS: Dict[str, Callable[[UnifiedDataManager, Any], int]] = {
+    'create-exp': _handle_create_exp,
+    'delete-exp': _handle_delete_exp,
+    'list-exp': _handle_list_exp,
+    'health-check': _handle_health_check,
+    'backup-exp': _handle_backup_exp,
+    'status': _handle_status
+}
+
+# 需要指定 --experiment 的操作
+ACTIONS_REQUIRING_EXPERIMENT = {'create-exp', 'delete-exp', 'backup-exp'}
+
+# 支持逗号分隔多个实验名（批量执行）的操作
+ACTIONS_SUPPORTING_BULK = {'create-exp', 'delete-exp'}
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='KnowledgeRAG 统一数据管理工具')
-    parser.add_argument('--action', choices=[
-        'create-exp', 'delete-exp', 'list-exp', 'health-check', 
-        'backup-exp', 'status'
-    ], required=True, help='操作类型')
-    parser.add_argument('--experiment', '-e', help='实验名称')
+    parser.add_argument('--action', choices=list(HANDLERS), required=True, help='操作类型')
+    parser.add_argument('--experiment', '-e', help='实验名称（create-exp/delete-exp 可用逗号分隔多个实验）')
     parser.add_argument('--researcher', '-r', help='研究员名称')
     parser.add_argument('--description', '-d', help='实验描述')
     parser.add_argument('--template', '-t', default='basic_rag', help='模板名称')
@@ -620,6 +1117,15 @@ def main():
     parser.add_argument('--backup-dir', default='backups', help='备份目录')
     
     args = parser.parse_args()
+    _configure_logging()
+    
+    if args.action in ACTIONS_REQUIRING_EXPERIMENT and not args.experiment:
+        print("❌ 请指定实验名称 --experiment <name>")
+        return 1
+    
+    if args.experiment and args.action not in ACTIONS_SUPPORTING_BULK and ',' in args.experiment:
+        print(f"❌ {args.action} 只支持单个实验")
+        return 1
     
     # 创建统一数据管理器
     manager = UnifiedDataManager(SERVICES_CONFIG)
@@ -635,91 +1141,7 @@ def main():
             print(f"   {icon} {service.upper()}: {'已连接' if connected else '未连接'}")
         
         # 执行操作
-        if args.action == 'create-exp':
-            if not args.experiment:
-                print("❌ 请指定实验名称 --experiment <name>")
-                return 1
-            
-            print(f"\n🚀 创建实验: {args.experiment}")
-            results = manager.create_experiment(
-                args.experiment,
-                args.researcher or "",
-                args.description or "",
-                args.template
-            )
-            
-            print("📊 创建结果:")
-            for service, success in results.items():
-                icon = "✅" if success else "❌"
-                print(f"   {icon} {service.upper()}: {'成功' if success else '失败'}")
-        
-        elif args.action == 'delete-exp':
-            if not args.experiment:
-                print("❌ 请指定实验名称 --experiment <name>")
-                return 1
-            
-            print(f"\n🗑️  删除实验: {args.experiment}")
-            results = manager.delete_experiment(args.experiment, args.force)
-            
-            if 'cancelled' in results:
-                print("❌ 操作已取消")
-            else:
-                print("📊 删除结果:")
-                for service, success in results.items():
-                    icon = "✅" if success else "❌"
-                    print(f"   {icon} {service.upper()}: {'成功' if success else '失败'}")
-        
-        elif args.action == 'list-exp':
-            print("\n📋 实验列表:")
-            experiments = manager.list_experiments()
-            
-            if not experiments:
-                print("   没有找到实验")
-            else:
-                for exp in experiments:
-                    print(f"\n🔬 {exp['name']}")
-                    print(f"   MySQL: {'✅' if exp['mysql_exists'] else '❌'}")
-                    print(f"   Milvus: {'✅' if exp['milvus_exists'] else '❌'}")
-                    print(f"   MinIO: {'✅' if exp['minio_exists'] else '❌'}")
-        
-        elif args.action == 'health-check':
-            print("\n🏥 健康检查:")
-            health = manager.health_check()
-            
-            for service, info in health.items():
-                status = info['status']
-                icon = "✅" if status == 'healthy' else "❌" if status == 'unhealthy' else "⚠️"
-                print(f"   {icon} {service.upper()}: {status}")
-                
-                if 'version' in info:
-                    print(f"      版本: {info['version']}")
-                if 'error' in info:
-                    print(f"      错误: {info['error']}")
-                if 'experiments_count' in info:
-                    print(f"      实验数: {info['experiments_count']}")
-        
-        elif args.action == 'backup-exp':
-            if not args.experiment:
-                print("❌ 请指定实验名称 --experiment <name>")
-                return 1
-            
-            print(f"\n💾 备份实验: {args.experiment}")
-            results = manager.backup_experiment(args.experiment, args.backup_dir)
-            
-            print("📊 备份结果:")
-            for service, success in results.items():
-                icon = "✅" if success else "❌"
-                print(f"   {icon} {service.upper()}: {'成功' if success else '失败'}")
-        
-        elif args.action == 'status':
-            print("\n📊 系统状态:")
-            print(f"   实验数量: {len(manager.list_experiments())}")
-            
-            health = manager.health_check()
-            healthy_services = sum(1 for info in health.values() if info['status'] == 'healthy')
-            print(f"   健康服务: {healthy_services}/{len(health)}")
-        
-        return 0
+        return HANDLERS[args.action](manager, args)
         
     except Exception as e:
         logger.error(f"操作失败: {e}")
@@ -730,4 +1152,4 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
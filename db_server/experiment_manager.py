@@ -5,54 +5,122 @@ KnowledgeRAG 实验管理工具
 用途: 为研究员提供便捷的实验环境管理界面
 """
 
+import io
 import os
+import inspect
 import sys
-import json
 import yaml
 import argparse
+import shlex
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-import subprocess
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Optional
+
+# 优先使用 LibYAML 的 C 实现
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# 保存实验配置时的 yaml.dump 参数，模块加载时构造一次
+_DUMPER_KW = {
+    'Dumper': SafeDumper,
+    'default_flow_style': False,
+    'allow_unicode': True,
+    'sort_keys': False
+}
+
+# 机器写入的缓存文件优先使用 orjson（C 实现，直接输出 bytes）
+try:
+    import orjson
+    _json_dumps = lambda obj: orjson.dumps(obj, default=str)
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_dumps = lambda obj: json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
+    _json_loads = json.loads
 
 # 添加src目录到Python路径
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from manage_table import ExperimentManager
-from experiment_schemas import ExperimentSchemaManager
+from experiment_schemas import get_manager
+
+if TYPE_CHECKING:
+    from manage_table import ExperimentManager
+
+# MySQL 连接配置
+# 带 pool_name/pool_size 时 mysql.connector.connect 从进程内共享的连接池取连接，
+# disconnect 只是把连接归还连接池，重复连接无需重新握手认证
+MYSQL_CONFIG = {
+    'host': os.getenv('MYSQL_HOST', '127.0.0.1'),
+    'port': int(os.getenv('MYSQL_PORT', 3306)),
+    'user': os.getenv('MYSQL_USER', 'root'),
+    'password': os.getenv('MYSQL_PASSWORD', 'devpass'),
+    'charset': 'utf8mb4',
+    'collation': 'utf8mb4_unicode_ci',
+    'pool_name': 'exp',
+    'pool_size': 5
+}
 
 class ExperimentCLI:
     """实验管理命令行界面"""
     
+    __slots__ = (
+        '_experiment_manager', '_db_connected', 'schema_manager',
+        'current_experiment', 'config_file', 'config_cache_file',
+        '_experiments_cache', '_experiments_set', '_info_cache', '_commands'
+    )
+    
     def __init__(self):
-        self.experiment_manager = ExperimentManager({
-            'host': os.getenv('MYSQL_HOST', '127.0.0.1'),
-            'port': int(os.getenv('MYSQL_PORT', 3306)),
-            'user': os.getenv('MYSQL_USER', 'root'),
-            'password': os.getenv('MYSQL_PASSWORD', 'devpass'),
-            'charset': 'utf8mb4',
-            'collation': 'utf8mb4_unicode_ci'
-        })
-        
-        self.schema_manager = ExperimentSchemaManager()
+        # manage_table 会加载 MySQL 驱动，推迟到首次访问 experiment_manager 时再导入
+        self._experiment_manager: Optional['ExperimentManager'] = None
+        self._db_connected = False
+        
+        self.schema_manager = get_manager()
         self.current_experiment = None
         self.config_file = Path("current_experiment.yaml")
-        
-        # 尝试连接数据库
-        if not self.experiment_manager.connect():
-            print("⚠️  无法连接到数据库，请检查配置和服务状态")
-            sys.exit(1)
+        self.config_cache_file = Path("current_experiment.yaml.cache.json")
+        self._experiments_cache: Optional[List[str]] = None
+        self._experiments_set: set = set()
+        self._info_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        
+        # 交互模式命令 -> 处理方法
+        self._commands = {
+            'create': self._cmd_create,
+            'list': self._cmd_list,
+            'switch': self._cmd_switch,
+            'delete': self._cmd_delete,
+            'info': self._cmd_info,
+            'status': self._cmd_status,
+            'templates': self._cmd_templates,
+            'note': self._cmd_note
+        }
         
         # 加载当前实验配置
         self._load_current_experiment()
     
+    @property
+    def experiment_manager(self) -> 'ExperimentManager':
+        """实验管理器（首次访问时才连接数据库，模板相关命令无需数据库）"""
+        if not self._db_connected:
+            from manage_table import ExperimentManager
+            self._experiment_manager = ExperimentManager(MYSQL_CONFIG)
+            if not self._experiment_manager.connect():
+                print("⚠️  无法连接到数据库，请检查配置和服务状态")
+                sys.exit(1)
+            self._db_connected = True
+        return self._experiment_manager
+    
     def _load_current_experiment(self):
-        """加载当前实验配置"""
+        """加载当前实验配置（JSON 缓存未过期时跳过 YAML 解析）"""
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f)
-                    self.current_experiment = config.get('current_experiment')
+                config = self._read_config_cache()
+                if config is None:
+                    with open(self.config_file, 'r', encoding='utf-8') as f:
+                        config = yaml.load(f, Loader=SafeLoader)
+                    self._write_config_cache(config)
+                self.current_experiment = config.get('current_experiment')
             except Exception as e:
                 print(f"⚠️  加载实验配置失败: {e}")
     
@@ -64,10 +132,60 @@ class ExperimentCLI:
                 'updated_at': datetime.now().isoformat()
             }
             with open(self.config_file, 'w', encoding='utf-8') as f:
-                yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+                yaml.dump(config, f, **_DUMPER_KW)
+            self._write_config_cache(config)
         except Exception as e:
             print(f"⚠️  保存实验配置失败: {e}")
     
+    def _read_config_cache(self) -> Optional[Dict[str, Any]]:
+        """读取实验配置的 JSON 缓存；缓存不存在或比 YAML 旧时返回 None"""
+        try:
+            if self.config_cache_file.stat().st_mtime < self.config_file.stat().st_mtime:
+                return None
+            return _json_loads(self.config_cache_file.read_bytes())
+        except (OSError, ValueError):
+            return None
+    
+    def _write_config_cache(self, config: Dict[str, Any]):
+        """写入实验配置的 JSON 缓存，mtime 与 YAML 文件保持一致"""
+        try:
+            self.config_cache_file.write_bytes(_json_dumps(config))
+            yaml_mtime = self.config_file.stat().st_mtime
+            os.utime(self.config_cache_file, (yaml_mtime, yaml_mtime))
+        except OSError:
+            # 缓存写入失败不影响主流程，下次启动重新解析 YAML
+            pass
+    
+    def _list_experiments(self) -> List[str]:
+        """获取实验列表（同一命令内只查询一次，创建/删除后失效）"""
+        if self._experiments_cache is None:
+            self._experiments_cache = self.experiment_manager.list_experiments()
+            self._experiments_set = set(self._experiments_cache)
+        return self._experiments_cache
+    
+    def _experiment_exists(self, name: str) -> bool:
+        """判断实验是否存在（基于缓存的集合做 O(1) 查找）"""
+        self._list_experiments()
+        return name in self._experiments_set
+    
+    def _get_info(self, name: str) -> Optional[Dict[str, Any]]:
+        """获取实验信息（按实验名缓存，修改实验后失效）"""
+        if name not in self._info_cache:
+            self._info_cache[name] = self.experiment_manager.get_experiment_info(name)
+        return self._info_cache[name]
+    
+    def _get_infos(self, names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """批量获取实验信息，已缓存的直接复用（ExperimentManager 只持有一个非线程安全的连接，逐个串行查询）"""
+        return {name: self._get_info(name) for name in names}
+    
+    @staticmethod
+    def _total_records(info: Dict[str, Any]) -> int:
+        """实验总记录数：优先使用 get_experiment_info 在 SQL 侧聚合好的 total_records"""
+        total = info.get('total_records')
+        if total is None:
+            total = sum(info['tables'].values())
+        return total
+    
     def create_experiment(
         self, name: str, 
         researcher: str = "", 
@@ -78,7 +196,7 @@ class ExperimentCLI:
         """创建新实验"""
         try:
             # 检查实验是否已存在
-            if name in self.experiment_manager.list_experiments():
+            if self._experiment_exists(name):
                 print(f"❌ 实验 '{name}' 已存在")
                 return False
             
@@ -88,23 +206,33 @@ class ExperimentCLI:
                 print(f"❌ 未找到模板: {template}")
                 return False
             
-            # 创建临时schema文件
-            temp_schema = Path(f"temp_schema_{name}.sql")
-            with open(temp_schema, 'w', encoding='utf-8') as f:
-                f.write(schema_sql)
-            
-            # 创建实验
-            success = self.experiment_manager.create_experiment(
-                experiment_name=name,
-                researcher=researcher,
-                description=description,
-                schema_file=str(temp_schema)
-            )
-            
-            # 清理临时文件
-            temp_schema.unlink()
+            # 创建实验：ExperimentManager 支持 schema_sql 时直接传字符串，否则写临时schema文件
+            create = self.experiment_manager.create_experiment
+            if 'schema_sql' in inspect.signature(create).parameters:
+                success = create(
+                    experiment_name=name,
+                    researcher=researcher,
+                    description=description,
+                    schema_sql=schema_sql
+                )
+            else:
+                temp_schema = Path(f"temp_schema_{name}.sql")
+                with open(temp_schema, 'w', encoding='utf-8') as f:
+                    f.write(schema_sql)
+                try:
+                    success = create(
+                        experiment_name=name,
+                        researcher=researcher,
+                        description=description,
+                        schema_file=str(temp_schema)
+                    )
+                finally:
+                    # 清理临时文件
+                    temp_schema.unlink(missing_ok=True)
             
             if success:
+                self._experiments_cache = None
+                self._info_cache.pop(name, None)
                 print(f"✅ 实验 '{name}' 创建成功")
                 print(f"📊 数据库: knowledge_rag_{name}")
                 print(f"📄 配置文件: experiments/{name}.yaml")
@@ -122,45 +250,49 @@ class ExperimentCLI:
     
     def list_experiments(self):
         """列出所有实验"""
-        experiments = self.experiment_manager.list_experiments()
+        experiments = self._list_experiments()
         
         if not experiments:
             print("📋 没有找到实验环境")
             print("💡 使用 'create' 命令创建新实验")
             return
         
-        print(f"📋 实验环境列表 ({len(experiments)} 个):")
-        print("-" * 80)
+        # 输出先写入缓冲区，最后一次性写到 stdout
+        buf = io.StringIO()
+        print(f"📋 实验环境列表 ({len(experiments)} 个):", file=buf)
+        print("-" * 80, file=buf)
+        
+        # 循环前一次性获取所有实验信息
+        infos = self._get_infos(experiments)
         
         for i, exp_name in enumerate(experiments, 1):
-            # 获取实验信息
-            info = self.experiment_manager.get_experiment_info(exp_name)
+            info = infos[exp_name]
             
             # 当前实验标记
             current_marker = "👉 " if exp_name == self.current_experiment else "   "
             
-            print(f"{current_marker}{i}. {exp_name}")
+            print(f"{current_marker}{i}. {exp_name}", file=buf)
             
             if info:
-                print(f"      研究员: {info.get('researcher', 'N/A')}")
-                print(f"      描述: {info.get('description', 'N/A')}")
-                print(f"      创建时间: {info.get('created_at', 'N/A')}")
+                print(f"      研究员: {info.get('researcher', 'N/A')}", file=buf)
+                print(f"      描述: {info.get('description', 'N/A')}", file=buf)
+                print(f"      创建时间: {info.get('created_at', 'N/A')}", file=buf)
                 
                 if info.get('tables'):
                     table_count = len(info['tables'])
-                    total_records = sum(info['tables'].values())
-                    print(f"      表数量: {table_count}, 总记录: {total_records}")
+                    total_records = self._total_records(info)
+                    print(f"      表数量: {table_count}, 总记录: {total_records}", file=buf)
                 
                 if info.get('notes'):
-                    print(f"      笔记数: {len(info['notes'])}")
+                    print(f"      笔记数: {len(info['notes'])}", file=buf)
             
-            print()
+            print(file=buf)
+        
+        sys.stdout.write(buf.getvalue())
     
     def switch_experiment(self, name: str):
         """切换实验"""
-        experiments = self.experiment_manager.list_experiments()
-        
-        if name not in experiments:
+        if not self._experiment_exists(name):
             print(f"❌ 实验 '{name}' 不存在")
             return False
         
@@ -173,7 +305,7 @@ class ExperimentCLI:
             print(f"✅ 已切换到实验: {name}")
             
             # 显示实验信息
-            info = self.experiment_manager.get_experiment_info(name)
+            info = self._get_info(name)
             if info:
                 print(f"📊 数据库: knowledge_rag_{name}")
                 print(f"👤 研究员: {info.get('researcher', 'N/A')}")
@@ -187,9 +319,7 @@ class ExperimentCLI:
     
     def delete_experiment(self, name: str, force: bool = False):
         """删除实验"""
-        experiments = self.experiment_manager.list_experiments()
-        
-        if name not in experiments:
+        if not self._experiment_exists(name):
             print(f"❌ 实验 '{name}' 不存在")
             return False
         
@@ -206,6 +336,8 @@ class ExperimentCLI:
             success = self.experiment_manager.delete_experiment(name)
             
             if success:
+                self._experiments_cache = None
+                self._info_cache.pop(name, None)
                 print(f"✅ 实验 '{name}' 删除成功")
                 
                 # 如果删除的是当前实验，清除当前实验
@@ -225,52 +357,56 @@ class ExperimentCLI:
     
     def show_experiment_info(self, name: str):
         """显示实验详细信息"""
-        if name not in self.experiment_manager.list_experiments():
+        if not self._experiment_exists(name):
             print(f"❌ 实验 '{name}' 不存在")
             return False
         
-        info = self.experiment_manager.get_experiment_info(name)
+        info = self._get_info(name)
         if not info:
             print(f"❌ 无法获取实验信息: {name}")
             return False
         
-        print(f"📊 实验详情: {name}")
-        print("=" * 50)
-        print(f"👤 研究员: {info.get('researcher', 'N/A')}")
-        print(f"📝 描述: {info.get('description', 'N/A')}")
-        print(f"🕐 创建时间: {info.get('created_at', 'N/A')}")
-        print(f"🗄️  数据库: {info.get('database', 'N/A')}")
-        print(f"📋 Schema文件: {info.get('schema_file', 'N/A')}")
+        # 输出先写入缓冲区，最后一次性写到 stdout
+        buf = io.StringIO()
+        print(f"📊 实验详情: {name}", file=buf)
+        print("=" * 50, file=buf)
+        print(f"👤 研究员: {info.get('researcher', 'N/A')}", file=buf)
+        print(f"📝 描述: {info.get('description', 'N/A')}", file=buf)
+        print(f"🕐 创建时间: {info.get('created_at', 'N/A')}", file=buf)
+        print(f"🗄️  数据库: {info.get('database', 'N/A')}", file=buf)
+        print(f"📋 Schema文件: {info.get('schema_file', 'N/A')}", file=buf)
         
         # 表信息
         if info.get('tables'):
-            print(f"\n📊 数据表 ({len(info['tables'])} 个):")
+            print(f"\n📊 数据表 ({len(info['tables'])} 个):", file=buf)
             for table, count in info['tables'].items():
-                print(f"   {table}: {count} 条记录")
+                print(f"   {table}: {count} 条记录", file=buf)
         
         # 自定义表
         if info.get('custom_tables'):
-            print(f"\n🔧 自定义表 ({len(info['custom_tables'])} 个):")
+            print(f"\n🔧 自定义表 ({len(info['custom_tables'])} 个):", file=buf)
             for table, details in info['custom_tables'].items():
-                print(f"   {table}: {details.get('created_at', 'N/A')}")
+                print(f"   {table}: {details.get('created_at', 'N/A')}", file=buf)
         
         # 实验笔记
         if info.get('notes'):
-            print(f"\n📝 实验笔记 ({len(info['notes'])} 条):")
+            print(f"\n📝 实验笔记 ({len(info['notes'])} 条):", file=buf)
             for note in info['notes'][-5:]:  # 显示最近5条
-                print(f"   [{note['timestamp']}] {note['note']}")
+                print(f"   [{note['timestamp']}] {note['note']}", file=buf)
         
+        sys.stdout.write(buf.getvalue())
         return True
     
     def add_note(self, experiment_name: str, note: str):
         """添加实验笔记"""
-        if experiment_name not in self.experiment_manager.list_experiments():
+        if not self._experiment_exists(experiment_name):
             print(f"❌ 实验 '{experiment_name}' 不存在")
             return False
         
         try:
             success = self.experiment_manager.add_experiment_note(experiment_name, note)
             if success:
+                self._info_cache.pop(experiment_name, None)
                 print(f"✅ 笔记已添加到实验: {experiment_name}")
                 return True
             else:
@@ -326,17 +462,17 @@ class ExperimentCLI:
         return True
     
     def generate_template_sql(self, template_name: str, output_file: str = None):
-        """生成模板SQL"""
-        sql = self.schema_manager.generate_schema_sql(template_name)
+        """生成模板SQL（逐行写出，不拼接完整字符串）"""
+        sql_lines = self.schema_manager.iter_schema_sql(template_name)
         
-        if not sql:
+        if sql_lines is None:
             print(f"❌ 模板 '{template_name}' 不存在")
             return False
         
         if output_file:
             try:
                 with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(sql)
+                    f.writelines(sql_lines)
                 print(f"✅ SQL已生成到: {output_file}")
             except Exception as e:
                 print(f"❌ 保存SQL失败: {e}")
@@ -344,47 +480,53 @@ class ExperimentCLI:
         else:
             print(f"📄 模板 '{template_name}' 的SQL:")
             print("-" * 50)
-            print(sql)
+            sys.stdout.writelines(sql_lines)
         
         return True
     
     def status(self):
         """显示当前状态"""
-        print("📊 KnowledgeRAG 实验环境状态")
-        print("=" * 50)
+        # 输出先写入缓冲区，最后一次性写到 stdout
+        buf = io.StringIO()
+        print("📊 KnowledgeRAG 实验环境状态", file=buf)
+        print("=" * 50, file=buf)
         
         # 数据库连接状态
-        print(f"🔗 数据库连接: {'✅ 已连接' if self.experiment_manager.connection else '❌ 未连接'}")
+        print(f"🔗 数据库连接: {'✅ 已连接' if self.experiment_manager.connection else '❌ 未连接'}", file=buf)
+        
+        # 两次MySQL查询共用一个连接（非线程安全），串行执行
+        info = self._get_info(self.current_experiment) if self.current_experiment else None
+        experiments = self._list_experiments()
         
         # 当前实验
         if self.current_experiment:
-            print(f"🎯 当前实验: {self.current_experiment}")
+            print(f"🎯 当前实验: {self.current_experiment}", file=buf)
             
             # 显示实验信息
-            info = self.experiment_manager.get_experiment_info(self.current_experiment)
             if info:
-                print(f"👤 研究员: {info.get('researcher', 'N/A')}")
-                print(f"📊 数据库: knowledge_rag_{self.current_experiment}")
+                print(f"👤 研究员: {info.get('researcher', 'N/A')}", file=buf)
+                print(f"📊 数据库: knowledge_rag_{self.current_experiment}", file=buf)
                 if info.get('tables'):
                     table_count = len(info['tables'])
-                    total_records = sum(info['tables'].values())
-                    print(f"📋 表数量: {table_count}, 总记录: {total_records}")
+                    total_records = self._total_records(info)
+                    print(f"📋 表数量: {table_count}, 总记录: {total_records}", file=buf)
         else:
-            print("🎯 当前实验: 未选择")
+            print("🎯 当前实验: 未选择", file=buf)
         
         # 实验总数
-        experiments = self.experiment_manager.list_experiments()
-        print(f"📂 总实验数: {len(experiments)}")
+        print(f"📂 总实验数: {len(experiments)}", file=buf)
         
         # 可用模板
         templates = self.schema_manager.list_templates()
-        print(f"📄 可用模板: {len(templates)}")
+        print(f"📄 可用模板: {len(templates)}", file=buf)
         
         # 配置信息
-        print(f"\n🔧 配置信息:")
-        print(f"   MySQL Host: {os.getenv('MYSQL_HOST', '127.0.0.1')}")
-        print(f"   MySQL Port: {os.getenv('MYSQL_PORT', '3306')}")
-        print(f"   MySQL User: {os.getenv('MYSQL_USER', 'root')}")
+        print(f"\n🔧 配置信息:", file=buf)
+        print(f"   MySQL Host: {os.getenv('MYSQL_HOST', '127.0.0.1')}", file=buf)
+        print(f"   MySQL Port: {os.getenv('MYSQL_PORT', '3306')}", file=buf)
+        print(f"   MySQL User: {os.getenv('MYSQL_USER', 'root')}", file=buf)
+        
+        sys.stdout.write(buf.getvalue())
     
     def interactive_mode(self):
         """交互模式"""
@@ -409,62 +551,13 @@ class ExperimentCLI:
                     self._show_help()
                     continue
                 
-                # 解析命令
-                args = command.split()
+                # 解析命令（支持引号包裹含空格的参数）
+                args = shlex.split(command)
                 cmd = args[0]
                 
-                if cmd == 'create':
-                    if len(args) < 2:
-                        print("❌ 用法: create <实验名> [研究员] [描述] [模板]")
-                        continue
-                    
-                    name = args[1]
-                    researcher = args[2] if len(args) > 2 else ""
-                    description = args[3] if len(args) > 3 else ""
-                    template = args[4] if len(args) > 4 else "basic_rag"
-                    
-                    self.create_experiment(name, researcher, description, template)
-                
-                elif cmd == 'list':
-                    self.list_experiments()
-                
-                elif cmd == 'switch':
-                    if len(args) < 2:
-                        print("❌ 用法: switch <实验名>")
-                        continue
-                    self.switch_experiment(args[1])
-                
-                elif cmd == 'delete':
-                    if len(args) < 2:
-                        print("❌ 用法: delete <实验名>")
-                        continue
-                    self.delete_experiment(args[1])
-                
-                elif cmd == 'info':
-                    if len(args) < 2:
-                        if self.current_experiment:
-                            self.show_experiment_info(self.current_experiment)
-                        else:
-                            print("❌ 请指定实验名或先切换到实验")
-                        continue
-                    self.show_experiment_info(args[1])
-                
-                elif cmd == 'status':
-                    self.status()
-                
-                elif cmd == 'templates':
-                    self.list_templates()
-                
-                elif cmd == 'note':
-                    if len(args) < 2:
-                        print("❌ 用法: note <笔记内容>")
-                        continue
-                    if not self.current_experiment:
-                        print("❌ 请先切换到实验")
-                        continue
-                    note = " ".join(args[1:])
-                    self.add_note(self.current_experiment, note)
-                
+                handler = self._commands.get(cmd)
+                if handler:
+                    handler(args[1:])
                 else:
                     print(f"❌ 未知命令: {cmd}")
                     print("💡 输入 'help' 查看帮助")
@@ -475,6 +568,57 @@ class ExperimentCLI:
             except Exception as e:
                 print(f"❌ 命令执行失败: {e}")
     
+    def _cmd_create(self, args: List[str]):
+        if not args:
+            print("❌ 用法: create <实验名> [研究员] [描述] [模板]")
+            return
+        
+        name = args[0]
+        researcher = args[1] if len(args) > 1 else ""
+        description = args[2] if len(args) > 2 else ""
+        template = args[3] if len(args) > 3 else "basic_rag"
+        
+        self.create_experiment(name, researcher, description, template)
+    
+    def _cmd_list(self, args: List[str]):
+        self.list_experiments()
+    
+    def _cmd_switch(self, args: List[str]):
+        if not args:
+            print("❌ 用法: switch <实验名>")
+            return
+        self.switch_experiment(args[0])
+    
+    def _cmd_delete(self, args: List[str]):
+        if not args:
+            print("❌ 用法: delete <实验名>")
+            return
+        self.delete_experiment(args[0])
+    
+    def _cmd_info(self, args: List[str]):
+        if not args:
+            if self.current_experiment:
+                self.show_experiment_info(self.current_experiment)
+            else:
+                print("❌ 请指定实验名或先切换到实验")
+            return
+        self.show_experiment_info(args[0])
+    
+    def _cmd_status(self, args: List[str]):
+        self.status()
+    
+    def _cmd_templates(self, args: List[str]):
+        self.list_templates()
+    
+    def _cmd_note(self, args: List[str]):
+        if not args:
+            print("❌ 用法: note <笔记内容>")
+            return
+        if not self.current_experiment:
+            print("❌ 请先切换到实验")
+            return
+        self.add_note(self.current_experiment, " ".join(args))
+    
     def _show_help(self):
         """显示帮助信息"""
         print("🆘 命令帮助:")
@@ -492,11 +636,33 @@ class ExperimentCLI:
     
     def cleanup(self):
         """清理资源"""
-        if self.experiment_manager.connection:
-            self.experiment_manager.disconnect()
+        if self._db_connected and self._experiment_manager.connection:
+            self._experiment_manager.disconnect()
 
-def main():
-    """主函数"""
+def _handle_default(cli: ExperimentCLI, args):
+    # 默认显示状态
+    cli.status()
+    print("\n💡 使用 --help 查看帮助，--interactive 进入交互模式")
+
+# 命令行选项 -> 处理函数，按优先级排列，取第一个被设置的选项
+HANDLERS: Dict[str, Callable[[ExperimentCLI, Any], Any]] = {
+    'interactive': lambda cli, args: cli.interactive_mode(),
+    'create': lambda cli, args: cli.create_experiment(
+        args.create,
+        args.researcher or "",
+        args.description or "",
+        args.template
+    ),
+    'list': lambda cli, args: cli.list_experiments(),
+    'switch': lambda cli, args: cli.switch_experiment(args.switch),
+    'delete': lambda cli, args: cli.delete_experiment(args.delete, args.force),
+    'info': lambda cli, args: cli.show_experiment_info(args.info),
+    'status': lambda cli, args: cli.status(),
+    'templates': lambda cli, args: cli.list_templates()
+}
+
+def _build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
     parser = argparse.ArgumentParser(description='KnowledgeRAG 实验管理工具')
     parser.add_argument('--interactive', '-i', action='store_true', help='交互模式')
     parser.add_argument('--create', help='创建实验')
@@ -510,38 +676,22 @@ def main():
     parser.add_argument('--status', action='store_true', help='显示状态')
     parser.add_argument('--templates', action='store_true', help='列出模板')
     parser.add_argument('--force', '-f', action='store_true', help='强制执行')
-    
-    args = parser.parse_args()
+    return parser
+
+# 解析器配置固定不变，模块加载时构建一次
+_PARSER = _build_parser()
+
+def main():
+    """主函数"""
+    args = _PARSER.parse_args()
     
     # 创建CLI实例
     cli = ExperimentCLI()
     
     try:
-        if args.interactive:
-            cli.interactive_mode()
-        elif args.create:
-            cli.create_experiment(
-                args.create,
-                args.researcher or "",
-                args.description or "",
-                args.template
-            )
-        elif args.list:
-            cli.list_experiments()
-        elif args.switch:
-            cli.switch_experiment(args.switch)
-        elif args.delete:
-            cli.delete_experiment(args.delete, args.force)
-        elif args.info:
-            cli.show_experiment_info(args.info)
-        elif args.status:
-            cli.status()
-        elif args.templates:
-            cli.list_templates()
-        else:
-            # 默认显示状态
-            cli.status()
-            print("\n💡 使用 --help 查看帮助，--interactive 进入交互模式")
+        action = next((name for name in HANDLERS if getattr(args, name)), None)
+        handler = HANDLERS[action] if action else _handle_default
+        handler(cli, args)
         
         return 0
         
@@ -5,12 +5,89 @@ KnowledgeRAG 实验表结构配置工具
 """
 
 import os
+import sys
+import copy
 import yaml
-import json
-from typing import Dict, List, Any, Optional
+import functools
+from typing import Dict, Iterator, List, Any, Optional, TextIO, Tuple
 from pathlib import Path
 from datetime import datetime
 
+# 优先使用 LibYAML 的 C 实现，不可用时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# JSON 优先使用 orjson（C 实现，直接读写 bytes）
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = lambda obj: orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+    _json_loads = json.loads
+    _json_dumps = lambda obj: json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
+
+# 各默认模板共用的列定义（add_table 会逐列复制，各表互不共享）
+ID_COLUMN = {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True}
+CREATED_AT_COLUMN = {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+USER_ID_COLUMN = {"name": "user_id", "type": "BIGINT", "not_null": True}
+
+# _create_default_templates 生成的模板名
+DEFAULT_TEMPLATES = frozenset({'basic_rag', 'vector_experiment', 'flexible_json', 'graph_database'})
+
+def _write_json_sidecar(json_path: Path, encoded: bytes):
+    """写入模板的 JSON 缓存文件（与 YAML 同名，后缀为 .json）"""
+    try:
+        json_path.write_bytes(encoded)
+    except OSError:
+        # 缓存写入失败不影响主流程，下次仍解析 YAML
+        pass
+
+@functools.lru_cache(maxsize=128)
+def _load_template_data(path: str, mtime_ns: int) -> Dict:
+    """解析模板文件，以 (路径, mtime) 为键缓存，文件修改后自动重新解析"""
+    yaml_path = Path(path)
+    json_path = yaml_path.with_suffix('.json')
+    
+    # JSON 缓存不比 YAML 旧时直接读取，跳过 YAML 解析
+    try:
+        if json_path.stat().st_mtime_ns >= mtime_ns:
+            return _json_loads(json_path.read_bytes())
+    except (OSError, ValueError):
+        pass
+    
+    # 以二进制读取，由 LibYAML 直接处理 UTF-8 解码
+    with open(yaml_path, 'rb') as f:
+        data = yaml.load(f.read(), Loader=SafeLoader)
+    
+    # 按 JSON 的类型规则归一化（日期转字符串、键转字符串），与之后读取缓存文件得到的结果一致
+    encoded = _json_dumps(data)
+    _write_json_sidecar(json_path, encoded)
+    return _json_loads(encoded)
+
+def _render_column(col: Dict) -> str:
+    """渲染单个列定义：约束项组成元组，过滤空项后一次拼接"""
+    default = col.get('default')
+    if default is None:
+        default_sql = ''
+    elif isinstance(default, str):
+        default_sql = f"DEFAULT '{default}'"
+    else:
+        default_sql = f"DEFAULT {default}"
+    
+    tokens = (
+        col['name'],
+        col['type'],
+        'NOT NULL' if col.get('not_null', False) else '',
+        'AUTO_INCREMENT' if col.get('auto_increment', False) else '',
+        'PRIMARY KEY' if col.get('primary_key', False) else '',
+        default_sql,
+        f"COMMENT '{col['comment']}'" if col.get('comment') else ''
+    )
+    return "    " + " ".join(filter(None, tokens))
+
 class SchemaTemplate:
     """表结构模板类"""
     
@@ -20,79 +97,88 @@ class SchemaTemplate:
         self.tables: Dict[str, Dict] = {}
         self.created_at = datetime.now().isoformat()
         self.version = "1.0"
+        # 预渲染的每表SQL，表定义变化时置空
+        self._compiled_tables: Optional[List[str]] = None
     
     def add_table(self, table_name: str, columns: List[Dict], 
                   indexes: List[Dict] = None, foreign_keys: List[Dict] = None):
         """添加表定义"""
         self.tables[table_name] = {
-            'columns': columns,
+            # 逐列复制：共用的列定义不会被 YAML 写成锚点/别名，修改一个表也不会影响其他表
+            'columns': [dict(col) for col in columns],
             'indexes': indexes or [],
             'foreign_keys': foreign_keys or [],
             'created_at': datetime.now().isoformat()
         }
+        self._compiled_tables = None
     
     def generate_sql(self) -> str:
         """生成SQL创建语句"""
-        sql_statements = []
-        
+        return "".join(self.iter_sql())
+    
+    def generate_sql_to(self, fp: TextIO):
+        """将SQL创建语句直接写入已打开的文件对象，不拼接完整字符串"""
+        fp.writelines(self.iter_sql())
+    
+    def iter_sql(self) -> Iterator[str]:
+        """分段生成SQL创建语句（每段以换行结尾），便于流式写出"""
         # 添加头部注释
-        sql_statements.append(f"-- {self.name} 表结构")
-        sql_statements.append(f"-- 描述: {self.description}")
-        sql_statements.append(f"-- 创建时间: {self.created_at}")
-        sql_statements.append(f"-- 版本: {self.version}")
-        sql_statements.append("")
-        
-        # 创建表
+        yield f"-- {self.name} 表结构\n"
+        yield f"-- 描述: {self.description}\n"
+        yield f"-- 创建时间: {self.created_at}\n"
+        yield f"-- 版本: {self.version}\n"
+        yield "\n"
+        
+        # 创建表（每张表的语句在首次生成时渲染并缓存）
+        if self._compiled_tables is None:
+            self._compile()
+        yield from self._compiled_tables
+    
+    def _compile(self) -> List[str]:
+        """将每张表的建表、外键和索引语句预先渲染为一个字符串，缓存到 _compiled_tables"""
+        compiled = []
         for table_name, table_def in self.tables.items():
-            sql_statements.append(f"-- 表: {table_name}")
-            sql_statements.append(f"CREATE TABLE IF NOT EXISTS {table_name} (")
+            parts = [
+                f"-- 表: {table_name}\n",
+                f"CREATE TABLE IF NOT EXISTS {table_name} (\n"
+            ]
             
-            # 列定义
-            columns_sql = []
+            # 列定义与外键约束
+            first = True
             for col in table_def['columns']:
-                col_sql = f"    {col['name']} {col['type']}"
-                
-                # 添加约束
-                if col.get('not_null', False):
-                    col_sql += " NOT NULL"
-                if col.get('auto_increment', False):
-                    col_sql += " AUTO_INCREMENT"
-                if col.get('primary_key', False):
-                    col_sql += " PRIMARY KEY"
-                if col.get('default') is not None:
-                    if isinstance(col['default'], str):
-                        col_sql += f" DEFAULT '{col['default']}'"
-                    else:
-                        col_sql += f" DEFAULT {col['default']}"
-                if col.get('comment'):
-                    col_sql += f" COMMENT '{col['comment']}'"
-                
-                columns_sql.append(col_sql)
+                if not first:
+                    parts.append(",\n")
+                first = False
+                parts.append(_render_column(col))
             
             # 外键约束
             for fk in table_def.get('foreign_keys', []):
-                fk_sql = f"    FOREIGN KEY ({fk['column']}) REFERENCES {fk['ref_table']}({fk['ref_column']})"
+                if not first:
+                    parts.append(",\n")
+                first = False
+                parts.append(f"    FOREIGN KEY ({fk['column']}) REFERENCES {fk['ref_table']}({fk['ref_column']})")
                 if fk.get('on_delete'):
-                    fk_sql += f" ON DELETE {fk['on_delete']}"
+                    parts.append(f" ON DELETE {fk['on_delete']}")
                 if fk.get('on_update'):
-                    fk_sql += f" ON UPDATE {fk['on_update']}"
-                columns_sql.append(fk_sql)
+                    parts.append(f" ON UPDATE {fk['on_update']}")
             
-            sql_statements.append(",\n".join(columns_sql))
-            sql_statements.append(") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;")
-            sql_statements.append("")
+            parts.append("\n")
+            parts.append(") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;\n")
+            parts.append("\n")
             
             # 索引
             for idx in table_def.get('indexes', []):
                 idx_type = idx.get('type', 'INDEX')
-                idx_sql = f"CREATE {idx_type} idx_{table_name}_{idx['name']} ON {table_name}"
+                parts.append(f"CREATE {idx_type} idx_{table_name}_{idx['name']} ON {table_name}")
                 if idx.get('columns'):
-                    idx_sql += f" ({', '.join(idx['columns'])})"
-                sql_statements.append(idx_sql + ";")
+                    parts.append(f" ({', '.join(idx['columns'])})")
+                parts.append(";\n")
             
-            sql_statements.append("")
+            parts.append("\n")
+            compiled.append("".join(parts))
         
-        return "\n".join(sql_statements)
+        self._compiled_tables = compiled
+        return compiled
     
     def to_dict(self) -> Dict:
         """转换为字典"""
@@ -110,7 +196,8 @@ class SchemaTemplate:
         template = cls(data['name'], data['description'])
         template.version = data.get('version', '1.0')
         template.created_at = data.get('created_at', datetime.now().isoformat())
-        template.tables = data.get('tables', {})
+        # 深拷贝表定义，避免修改到缓存中的解析结果
+        template.tables = copy.deepcopy(data.get('tables', {}))
         return template
 
 class ExperimentSchemaManager:
@@ -120,7 +207,21 @@ class ExperimentSchemaManager:
         self.templates_dir = Path(templates_dir)
         self.templates_dir.mkdir(parents=True, exist_ok=True)
         
-        # 创建默认模板
+        # SQL缓存: 模板名 -> (文件mtime_ns, SQL)
+        self._sql_cache: Dict[str, Tuple[int, str]] = {}
+        # 模板名列表缓存: (目录mtime_ns, 模板名)
+        self._template_names: Optional[Tuple[int, List[str]]] = None
+        
+        # 默认模板已全部存在时不再重写
+        self.ensure_defaults()
+    
+    def ensure_defaults(self, force: bool = False):
+        """确保默认模板存在；force=True 时强制重新生成"""
+        if not force:
+            existing = {p.stem for p in self.templates_dir.glob("*.yaml")}
+            if DEFAULT_TEMPLATES <= existing:
+                return
+        
         self._create_default_templates()
     
     def _create_default_templates(self):
@@ -131,30 +232,30 @@ class ExperimentSchemaManager:
         
         # 用户表
         basic_rag.add_table("users", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
+            ID_COLUMN,
             {"name": "name", "type": "VARCHAR(255)", "not_null": True, "comment": "用户名"},
             {"name": "email", "type": "VARCHAR(255)", "comment": "邮箱"},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+            CREATED_AT_COLUMN
         ])
         
         # 文档表
         basic_rag.add_table("documents", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
-            {"name": "user_id", "type": "BIGINT", "not_null": True},
+            ID_COLUMN,
+            USER_ID_COLUMN,
             {"name": "title", "type": "VARCHAR(255)", "not_null": True},
             {"name": "content", "type": "LONGTEXT"},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+            CREATED_AT_COLUMN
         ], foreign_keys=[
             {"column": "user_id", "ref_table": "users", "ref_column": "id", "on_delete": "CASCADE"}
         ])
         
         # 块表
         basic_rag.add_table("chunks", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
+            ID_COLUMN,
             {"name": "document_id", "type": "BIGINT", "not_null": True},
             {"name": "text", "type": "MEDIUMTEXT", "not_null": True},
             {"name": "sequence", "type": "INT", "default": 0},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+            CREATED_AT_COLUMN
         ], foreign_keys=[
             {"column": "document_id", "ref_table": "documents", "ref_column": "id", "on_delete": "CASCADE"}
         ])
@@ -166,23 +267,23 @@ class ExperimentSchemaManager:
         
         # 向量表
         vector_exp.add_table("vectors", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
+            ID_COLUMN,
             {"name": "chunk_id", "type": "BIGINT", "not_null": True},
             {"name": "model_name", "type": "VARCHAR(100)", "not_null": True},
             {"name": "vector_dim", "type": "INT", "not_null": True},
             {"name": "milvus_id", "type": "VARCHAR(50)", "comment": "Milvus中的ID"},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+            CREATED_AT_COLUMN
         ])
         
         # 检索日志表
         vector_exp.add_table("retrieval_logs", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
+            ID_COLUMN,
             {"name": "query_text", "type": "TEXT", "not_null": True},
             {"name": "model_name", "type": "VARCHAR(100)"},
             {"name": "top_k", "type": "INT", "default": 10},
             {"name": "results", "type": "JSON", "comment": "检索结果"},
             {"name": "duration_ms", "type": "FLOAT", "comment": "耗时（毫秒）"},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+            CREATED_AT_COLUMN
         ])
         
         self.save_template(vector_exp)
@@ -192,25 +293,25 @@ class ExperimentSchemaManager:
         
         # 灵活文档表
         flexible_json.add_table("flexible_documents", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
-            {"name": "user_id", "type": "BIGINT", "not_null": True},
+            ID_COLUMN,
+            USER_ID_COLUMN,
             {"name": "doc_type", "type": "VARCHAR(50)", "default": "unknown"},
             {"name": "metadata", "type": "JSON", "comment": "文档元数据"},
             {"name": "content", "type": "LONGTEXT"},
             {"name": "properties", "type": "JSON", "comment": "自定义属性"},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"},
+            CREATED_AT_COLUMN,
             {"name": "updated_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
         ])
         
         # 灵活实验表
         flexible_json.add_table("experiments", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
+            ID_COLUMN,
             {"name": "name", "type": "VARCHAR(100)", "not_null": True},
             {"name": "config", "type": "JSON", "comment": "实验配置"},
             {"name": "results", "type": "JSON", "comment": "实验结果"},
             {"name": "metrics", "type": "JSON", "comment": "评估指标"},
             {"name": "status", "type": "ENUM('running', 'completed', 'failed')", "default": "running"},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+            CREATED_AT_COLUMN
         ])
         
         self.save_template(flexible_json)
@@ -220,22 +321,22 @@ class ExperimentSchemaManager:
         
         # 节点表
         graph_db.add_table("nodes", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
+            ID_COLUMN,
             {"name": "node_id", "type": "VARCHAR(100)", "not_null": True},
             {"name": "node_type", "type": "VARCHAR(50)", "not_null": True},
             {"name": "properties", "type": "JSON"},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+            CREATED_AT_COLUMN
         ])
         
         # 边表
         graph_db.add_table("edges", [
-            {"name": "id", "type": "BIGINT", "auto_increment": True, "primary_key": True},
+            ID_COLUMN,
             {"name": "from_node", "type": "VARCHAR(100)", "not_null": True},
             {"name": "to_node", "type": "VARCHAR(100)", "not_null": True},
             {"name": "relation_type", "type": "VARCHAR(50)", "not_null": True},
             {"name": "weight", "type": "FLOAT", "default": 1.0},
             {"name": "properties", "type": "JSON"},
-            {"name": "created_at", "type": "DATETIME", "default": "CURRENT_TIMESTAMP"}
+            CREATED_AT_COLUMN
         ])
         
         self.save_template(graph_db)
@@ -244,33 +345,61 @@ class ExperimentSchemaManager:
         """保存模板"""
         template_file = self.templates_dir / f"{template.name}.yaml"
         with open(template_file, 'w', encoding='utf-8') as f:
-            yaml.dump(template.to_dict(), f, default_flow_style=False, allow_unicode=True)
+            yaml.dump(template.to_dict(), f, Dumper=SafeDumper, default_flow_style=False,
+                      allow_unicode=True, sort_keys=False)
+        _write_json_sidecar(template_file.with_suffix('.json'), _json_dumps(template.to_dict()))
+        
+        self._sql_cache.pop(template.name, None)
+    
+    def _template_mtime(self, name: str) -> Optional[int]:
+        """模板文件的 mtime_ns，文件不存在时返回None"""
+        try:
+            return (self.templates_dir / f"{name}.yaml").stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
     
     def load_template(self, name: str) -> Optional[SchemaTemplate]:
-        """加载模板"""
-        template_file = self.templates_dir / f"{name}.yaml"
-        if not template_file.exists():
+        """加载模板（文件未修改时复用缓存的解析结果）"""
+        mtime_ns = self._template_mtime(name)
+        if mtime_ns is None:
             return None
         
-        with open(template_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        
+        data = _load_template_data(str(self.templates_dir / f"{name}.yaml"), mtime_ns)
         return SchemaTemplate.from_dict(data)
     
     def list_templates(self) -> List[str]:
-        """列出所有模板"""
-        templates = []
-        for file in self.templates_dir.glob("*.yaml"):
-            templates.append(file.stem)
-        return sorted(templates)
+        """列出所有模板（目录未变化时复用上次的结果）"""
+        dir_mtime_ns = self.templates_dir.stat().st_mtime_ns
+        if self._template_names is None or self._template_names[0] != dir_mtime_ns:
+            names = sorted(file.stem for file in self.templates_dir.glob("*.yaml"))
+            self._template_names = (dir_mtime_ns, names)
+        return list(self._template_names[1])
     
     def generate_schema_sql(self, template_name: str) -> Optional[str]:
-        """生成模板的SQL"""
+        """生成模板的SQL（模板文件未修改时直接返回缓存）"""
+        mtime_ns = self._template_mtime(template_name)
+        if mtime_ns is None:
+            return None
+        
+        cached = self._sql_cache.get(template_name)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
         template = self.load_template(template_name)
         if not template:
             return None
         
-        return template.generate_sql()
+        sql = template.generate_sql()
+        self._sql_cache[template_name] = (mtime_ns, sql)
+        return sql
+    
+    def iter_schema_sql(self, template_name: str) -> Optional[Iterator[str]]:
+        """逐行生成模板的SQL，模板不存在时返回None"""
+        template = self.load_template(template_name)
+        if not template:
+            return None
+        
+        return template.iter_sql()
     
     def create_custom_template(self, name: str, description: str, 
                               tables_config: Dict) -> SchemaTemplate:
@@ -288,6 +417,11 @@ class ExperimentSchemaManager:
         self.save_template(template)
         return template
 
+@functools.lru_cache(maxsize=1)
+def get_manager() -> ExperimentSchemaManager:
+    """获取进程内共享的模板管理器（首次调用时创建）"""
+    return ExperimentSchemaManager()
+
 def main():
     """命令行工具"""
     import argparse
@@ -303,7 +437,7 @@ def main():
     
     args = parser.parse_args()
     
-    manager = ExperimentSchemaManager()
+    manager = get_manager()
     
     if args.action == 'list':
         templates = manager.list_templates()
@@ -338,17 +472,18 @@ def main():
             print("请指定模板名称 --template <name>")
             return 1
         
-        sql = manager.generate_schema_sql(args.template)
-        if not sql:
+        template = manager.load_template(args.template)
+        if not template:
             print(f"未找到模板: {args.template}")
             return 1
         
+        # 逐段写出SQL，不在内存中保留完整字符串
         if args.output:
             with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(sql)
+                template.generate_sql_to(f)
             print(f"SQL已生成到: {args.output}")
         else:
-            print(sql)
+            template.generate_sql_to(sys.stdout)
     
     elif args.action == 'create':
         if not args.name or not args.config:
@@ -362,11 +497,11 @@ def main():
             print(f"配置文件不存在: {args.config}")
             return 1
         
-        with open(config_file, 'r', encoding='utf-8') as f:
+        with open(config_file, 'rb') as f:
             if config_file.suffix == '.json':
-                config = json.load(f)
+                config = _json_loads(f.read())
             else:
-                config = yaml.safe_load(f)
+                config = yaml.load(f.read(), Loader=SafeLoader)
         
         template = manager.create_custom_template(
             args.name,
@@ -380,5 +515,4 @@ def main():
     return 0
 
 if __name__ == '__main__':
-    import sys
     sys.exit(main()) 
\ No newline at end of file
@@ -8,13 +8,15 @@ KnowledgeRAG 快速入门示例
 2. 运行示例: python quick_start_example.py
 """
 
+import io
+import hashlib
 import os
+import re
 import sys
 import uuid
 import json
 from pathlib import Path
 from typing import List, Dict, Any
-from datetime import datetime
 
 # 添加源代码路径
 sys.path.append(str(Path(__file__).parent.parent / "src"))
@@ -22,8 +24,14 @@ sys.path.append(str(Path(__file__).parent.parent / "src"))
 # 导入工具模块
 from knowledge_rag.utils.s3_local import S3LocalClient
 from knowledge_rag.utils.mysql_client import get_mysql_client, ChunkIn
-from knowledge_rag.utils.milvus_client import get_milvus_client
-from knowledge_rag.utils.flexible_search import FlexibleSearchEngine, SearchQuery
+
+# 段落分隔：空行（允许只含缩进空白）
+PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+
+def _embedding_id(chunk_uid: str) -> int:
+    """由块UUID生成稳定的 63 位正整数ID（跨进程一致，重复运行可幂等写入）"""
+    digest = hashlib.blake2b(chunk_uid.encode('ascii'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & 0x7fffffffffffffff
 
 class QuickStartRAG:
     """快速入门RAG示例"""
@@ -41,23 +49,18 @@ class QuickStartRAG:
             self.mysql_client = None
         
         try:
-            # 添加超时处理
-            import signal
-            def timeout_handler(signum, frame):
-                raise TimeoutError("Milvus连接超时")
+            # pymilvus/numpy 导入较重，在此处按需导入
+            from knowledge_rag.utils.milvus_client import get_milvus_client
             
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(5)  # 5秒超时
-            
-            self.milvus_client = get_milvus_client()
-            signal.alarm(0)  # 取消超时
+            # 连接超时交给 pymilvus 处理（5秒）
+            self.milvus_client = get_milvus_client(timeout=5)
             print("✅ Milvus 客户端初始化成功")
         except Exception as e:
-            signal.alarm(0)  # 确保取消超时
             print(f"❌ Milvus 客户端初始化失败: {e}")
             self.milvus_client = None
         
         try:
+            from knowledge_rag.utils.flexible_search import FlexibleSearchEngine
             self.search_engine = FlexibleSearchEngine(experiment_name)
             print("✅ FlexibleSearchEngine 初始化成功")
         except Exception as e:
@@ -122,27 +125,19 @@ class QuickStartRAG:
         # 1. 生成文档UUID
         doc_uuid = str(uuid.uuid4())
         
-        # 2. 创建临时文件
-        temp_file = Path(f"temp_{doc_uuid}.txt")
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        # 3. 上传到对象存储
-        with open(temp_file, 'rb') as file:
-            uri = self.s3_client.put_object(
-                user_id=user_id,
-                doc_uuid=doc_uuid,
-                version_label="v1.0",
-                filename=f"{title}.txt",
-                file_stream=file,
-                content_type="text/plain",
-                metadata={"category": category}
-            )
-        
-        # 4. 清理临时文件
-        temp_file.unlink()
+        # 2. 上传到对象存储（内容直接从内存缓冲区读取，无需临时文件）
+        content_bytes = content.encode('utf-8')
+        uri = self.s3_client.put_object(
+            user_id=user_id,
+            doc_uuid=doc_uuid,
+            version_label="v1.0",
+            filename=f"{title}.txt",
+            file_stream=io.BytesIO(content_bytes),
+            content_type="text/plain",
+            metadata={"category": category}
+        )
         
-        # 5. 存储文档元数据到MySQL（模拟）
+        # 3. 存储文档元数据到MySQL（模拟）
         if self.mysql_client:
             try:
                 doc_id = self.mysql_client.create_document(
@@ -151,9 +146,8 @@ class QuickStartRAG:
                     mime_type="text/plain"
                 )
                 
-                import hashlib
                 # 生成唯一的checksum
-                checksum = hashlib.md5((uri + str(datetime.now())).encode()).hexdigest()
+                checksum = uuid.uuid4().hex
                 
                 version_id = self.mysql_client.create_version(
                     doc_id=doc_id,
@@ -175,20 +169,20 @@ class QuickStartRAG:
         """处理文本分块"""
         print(f"   📝 处理文本分块...")
         
-        # 简单分块策略：按段落分割
-        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+        # 简单分块策略：按段落分割，过滤太短的段落
+        paragraphs = [p for p in (raw.strip() for raw in PARAGRAPH_SPLIT.split(content)) if len(p) > 50]
         
-        chunk_records = []
-        for i, paragraph in enumerate(paragraphs):
-            if len(paragraph) > 50:  # 过滤太短的段落
-                chunk_uid = str(uuid.uuid4())
-                chunk_record = ChunkIn(
-                    seq_no=i,
-                    chunk_uid=chunk_uid,
-                    text=paragraph,
-                    token_count=len(paragraph.split())
-                )
-                chunk_records.append(chunk_record)
+        # 一次性构建全部文本块记录
+        new_uid = uuid.uuid4
+        chunk_records = [
+            ChunkIn(
+                seq_no=i,
+                chunk_uid=str(new_uid()),
+                text=paragraph,
+                token_count=len(paragraph.split())
+            )
+            for i, paragraph in enumerate(paragraphs)
+        ]
         
         # 存储chunks到MySQL（模拟）
         if self.mysql_client and version_id:
@@ -209,27 +203,32 @@ class QuickStartRAG:
             return False
         
         try:
-            for chunk in chunks:
-                # 生成模拟向量（实际应用中使用真实的embedding模型）
-                import numpy as np
-                # 从配置获取向量维度
-                from knowledge_rag.config import get_embedding_settings
-                embedding_settings = get_embedding_settings()
-                mock_vector = np.random.rand(embedding_settings.dimension).tolist()
-                
-                # 存储到Milvus
-                success = self.milvus_client.upsert_embedding(
-                    embedding_id=hash(chunk.chunk_uid) % (2**63),  # 确保为正数
+            import numpy as np
+            from knowledge_rag.utils.milvus_client import EmbeddingData
+            # 从配置获取向量维度（整批只读取一次）
+            from knowledge_rag.config import get_embedding_settings
+            dim = get_embedding_settings().dimension
+            
+            # 一次生成全部模拟向量（实际应用中使用真实的embedding模型）
+            rng = np.random.default_rng()
+            mock_vectors = rng.random((len(chunks), dim), dtype=np.float32).tolist()
+            
+            embeddings = [
+                EmbeddingData(
+                    embedding_id=_embedding_id(chunk.chunk_uid),
                     user_id=1,
                     doc_uuid=doc_uuid,
                     version_label="v1.0",
                     chunk_uid=chunk.chunk_uid,
                     vector=mock_vector
                 )
-                
-                if not success:
-                    print(f"   ❌ 向量存储失败: {chunk.chunk_uid}")
-                    return False
+                for chunk, mock_vector in zip(chunks, mock_vectors)
+            ]
+            
+            # 一次调用批量写入Milvus
+            if not self.milvus_client.batch_upsert_embeddings(embeddings):
+                print(f"   ❌ 向量存储失败: {len(chunks)} 个向量")
+                return False
             
             print(f"   ✅ 向量存储成功: {len(chunks)} 个向量")
             return True
@@ -246,6 +245,8 @@ class QuickStartRAG:
             print("   ⚠️  搜索引擎未初始化，跳过搜索测试")
             return
         
+        from knowledge_rag.utils.flexible_search import SearchQuery
+        
         for i, question in enumerate(questions, 1):
             print(f"\n   📋 测试 {i}: {question}")
             
@@ -5,24 +5,68 @@ KnowledgeRAG 配置管理模块
 """
 
 import os
+import json
 import logging
-from typing import Optional, Dict, Any
+import functools
+import threading
+from typing import Optional, Dict, Any, Callable, Mapping, Tuple
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, asdict, is_dataclass
 
-# 自动加载 .env 文件
-try:
-    from dotenv import load_dotenv
+logger = logging.getLogger(__name__)
+
+def _load_env_file(path: Path):
+    """读取 KEY=value 格式的 .env 文件，不覆盖已存在的环境变量"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    for raw_line in data.splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith(b'#') or b'=' not in line:
+            continue
+        if line.startswith(b'export '):
+            line = line[7:].lstrip()
+        
+        key, _, value = line.partition(b'=')
+        value = value.strip()
+        quote = value[:1]
+        if quote in (b'"', b"'") and value.find(quote, 1) != -1:
+            # 引号内的内容原样保留，闭合引号之后的内容（如行尾注释）忽略
+            value = value[1:value.find(quote, 1)]
+        elif b' #' in value:
+            # 未加引号的值去掉行尾注释
+            value = value.partition(b' #')[0].rstrip()
+        os.environ.setdefault(key.strip().decode('utf-8'), value.decode('utf-8'))
+
+@functools.lru_cache(maxsize=1)
+def _ensure_dotenv():
+    """加载 .env 文件（首次构建配置时执行，每个进程只执行一次）"""
     env_file = Path(__file__).parent.parent.parent / '.env'
-    if env_file.exists():
-        load_dotenv(env_file)
-        logging.info(f"已加载配置文件: {env_file}")
-except ImportError:
-    logging.warning("python-dotenv 未安装，将使用系统环境变量")
+    if not env_file.exists():
+        return
+    
+    _load_env_file(env_file)
+    logger.info("已加载配置文件: %s", env_file)
 
-logger = logging.getLogger(__name__)
+# 视为真值的环境变量取值（比较前统一转小写）
+_TRUTHY = frozenset({'1', 'true', 'yes', 'on', 't', 'y'})
+
+def _as_bool(value: Any) -> bool:
+    """将环境变量取值转换为布尔值"""
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUTHY
+    return bool(value)
 
-@dataclass
+def _env_kwargs(schema: Tuple[Tuple[str, str, Callable], ...], env: Mapping[str, str]) -> Dict[str, Any]:
+    """按 (字段名, 环境变量名, 类型) 表读取已设置的环境变量，未设置的字段交给 dataclass 默认值"""
+    kwargs = {}
+    for name, key, cast in schema:
+        value = env.get(key)
+        if value is not None:
+            kwargs[name] = _as_bool(value) if cast is bool else cast(value)
+    return kwargs
+
+@dataclass(slots=True, frozen=True)
 class DatabaseSettings:
     """数据库配置"""
     host: str = "127.0.0.1"
@@ -34,21 +78,24 @@ class DatabaseSettings:
     collation: str = "utf8mb4_unicode_ci"
     pool_size: int = 10
     
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('host', 'MYSQL_HOST', str),
+        ('port', 'MYSQL_PORT', int),
+        ('user', 'MYSQL_USER', str),
+        ('password', 'MYSQL_PASSWORD', str),
+        ('database', 'MYSQL_DB', str),
+        ('charset', 'MYSQL_CHARSET', str),
+        ('collation', 'MYSQL_COLLATION', str),
+        ('pool_size', 'MYSQL_POOL_SIZE', int)
+    )
+    
     @classmethod
-    def from_env(cls) -> 'DatabaseSettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'DatabaseSettings':
         """从环境变量创建数据库配置"""
-        return cls(
-            host=os.getenv('MYSQL_HOST', '127.0.0.1'),
-            port=int(os.getenv('MYSQL_PORT', '3306')),
-            user=os.getenv('MYSQL_USER', 'root'),
-            password=os.getenv('MYSQL_PASSWORD', 'devpass'),
-            database=os.getenv('MYSQL_DB', 'knowledge_rag'),
-            charset=os.getenv('MYSQL_CHARSET', 'utf8mb4'),
-            collation=os.getenv('MYSQL_COLLATION', 'utf8mb4_unicode_ci'),
-            pool_size=int(os.getenv('MYSQL_POOL_SIZE', '10'))
-        )
+        return cls(**_env_kwargs(cls._ENV_SCHEMA, os.environ if env is None else env))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MilvusSettings:
     """Milvus配置"""
     host: str = "127.0.0.1"
@@ -56,17 +103,20 @@ class MilvusSettings:
     collection_name: str = "rag_embeddings_v1"
     alias: str = "default"
     
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('host', 'MILVUS_HOST', str),
+        ('port', 'MILVUS_PORT', int),
+        ('collection_name', 'MILVUS_COLLECTION', str),
+        ('alias', 'MILVUS_ALIAS', str)
+    )
+    
     @classmethod
-    def from_env(cls) -> 'MilvusSettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'MilvusSettings':
         """从环境变量创建Milvus配置"""
-        return cls(
-            host=os.getenv('MILVUS_HOST', '127.0.0.1'),
-            port=int(os.getenv('MILVUS_PORT', '19530')),
-            collection_name=os.getenv('MILVUS_COLLECTION', 'rag_embeddings_v1'),
-            alias=os.getenv('MILVUS_ALIAS', 'default')
-        )
+        return cls(**_env_kwargs(cls._ENV_SCHEMA, os.environ if env is None else env))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ObjectStoreSettings:
     """对象存储配置"""
     type: str = "local"  # 目前只支持local
@@ -77,18 +127,21 @@ class ObjectStoreSettings:
     auto_create_dirs: bool = True
     max_file_size: int = 100 * 1024 * 1024  # 100MB
     
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('type', 'OBJECT_STORE_TYPE', str),
+        ('base_path', 'LOCAL_OBJECT_STORE_PATH', str),
+        ('experiments_dir', 'LOCAL_OBJECT_STORE_EXPERIMENTS_DIR', str),
+        ('auto_create_dirs', 'LOCAL_OBJECT_STORE_AUTO_CREATE_DIRS', bool),
+        ('max_file_size', 'LOCAL_OBJECT_STORE_MAX_FILE_SIZE', int)
+    )
+    
     @classmethod
-    def from_env(cls) -> 'ObjectStoreSettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'ObjectStoreSettings':
         """从环境变量创建对象存储配置"""
-        return cls(
-            type=os.getenv('OBJECT_STORE_TYPE', 'local'),
-            base_path=os.getenv('LOCAL_OBJECT_STORE_PATH', './data/local_object_store'),
-            experiments_dir=os.getenv('LOCAL_OBJECT_STORE_EXPERIMENTS_DIR', 'experiments'),
-            auto_create_dirs=os.getenv('LOCAL_OBJECT_STORE_AUTO_CREATE_DIRS', 'True').lower() == 'true',
-            max_file_size=int(os.getenv('LOCAL_OBJECT_STORE_MAX_FILE_SIZE', '104857600'))  # 100MB
-        )
+        return cls(**_env_kwargs(cls._ENV_SCHEMA, os.environ if env is None else env))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EmbeddingSettings:
     """嵌入模型配置"""
     model_name: str = "text-embedding-3-small"
@@ -100,19 +153,22 @@ class EmbeddingSettings:
     model_path: Optional[str] = None
     device: str = "auto"  # auto, cpu, cuda
     
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('model_name', 'EMBEDDING_MODEL', str),
+        ('dimension', 'EMBEDDING_DIMENSION', int),
+        ('batch_size', 'EMBEDDING_BATCH_SIZE', int),
+        ('max_seq_length', 'EMBEDDING_MAX_SEQ_LENGTH', int),
+        ('model_path', 'EMBEDDING_MODEL_PATH', str),
+        ('device', 'EMBEDDING_DEVICE', str)
+    )
+    
     @classmethod
-    def from_env(cls) -> 'EmbeddingSettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'EmbeddingSettings':
         """从环境变量创建嵌入模型配置"""
-        return cls(
-            model_name=os.getenv('EMBEDDING_MODEL', 'text-embedding-3-small'),
-            dimension=int(os.getenv('EMBEDDING_DIMENSION', '1536')),
-            batch_size=int(os.getenv('EMBEDDING_BATCH_SIZE', '32')),
-            max_seq_length=int(os.getenv('EMBEDDING_MAX_SEQ_LENGTH', '512')),
-            model_path=os.getenv('EMBEDDING_MODEL_PATH'),
-            device=os.getenv('EMBEDDING_DEVICE', 'auto')
-        )
+        return cls(**_env_kwargs(cls._ENV_SCHEMA, os.environ if env is None else env))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TokenBudgetSettings:
     """Token预算配置"""
     max_context_tokens: int = 2048
@@ -121,18 +177,21 @@ class TokenBudgetSettings:
     top_m_rerank: int = 5
     compression_ratio: float = 0.5
     
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('max_context_tokens', 'MAX_CONTEXT_TOKENS', int),
+        ('chunk_max_tokens', 'CHUNK_MAX_TOKENS', int),
+        ('top_k_raw', 'TOP_K_RAW', int),
+        ('top_m_rerank', 'TOP_M_RERANK', int),
+        ('compression_ratio', 'COMPRESSION_RATIO', float)
+    )
+    
     @classmethod
-    def from_env(cls) -> 'TokenBudgetSettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'TokenBudgetSettings':
         """从环境变量创建Token预算配置"""
-        return cls(
-            max_context_tokens=int(os.getenv('MAX_CONTEXT_TOKENS', '2048')),
-            chunk_max_tokens=int(os.getenv('CHUNK_MAX_TOKENS', '350')),
-            top_k_raw=int(os.getenv('TOP_K_RAW', '20')),
-            top_m_rerank=int(os.getenv('TOP_M_RERANK', '5')),
-            compression_ratio=float(os.getenv('COMPRESSION_RATIO', '0.5'))
-        )
+        return cls(**_env_kwargs(cls._ENV_SCHEMA, os.environ if env is None else env))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LoggingSettings:
     """日志配置"""
     level: str = "INFO"
@@ -140,17 +199,20 @@ class LoggingSettings:
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     backup_count: int = 5
     
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('level', 'LOG_LEVEL', str),
+        ('dir', 'LOG_DIR', str),
+        ('max_file_size', 'LOG_MAX_FILE_SIZE', int),
+        ('backup_count', 'LOG_BACKUP_COUNT', int)
+    )
+    
     @classmethod
-    def from_env(cls) -> 'LoggingSettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'LoggingSettings':
         """从环境变量创建日志配置"""
-        return cls(
-            level=os.getenv('LOG_LEVEL', 'INFO'),
-            dir=os.getenv('LOG_DIR', './logs'),
-            max_file_size=int(os.getenv('LOG_MAX_FILE_SIZE', '10485760')),
-            backup_count=int(os.getenv('LOG_BACKUP_COUNT', '5'))
-        )
+        return cls(**_env_kwargs(cls._ENV_SCHEMA, os.environ if env is None else env))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RetrievalSettings:
     """检索配置"""
     vector_similarity_threshold: float = 0.7
@@ -158,17 +220,20 @@ class RetrievalSettings:
     rerank_model: str = "bge-reranker-base"
     enable_compression: bool = True
     
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('vector_similarity_threshold', 'VECTOR_SIMILARITY_THRESHOLD', float),
+        ('enable_rerank', 'ENABLE_RERANK', bool),
+        ('rerank_model', 'RERANK_MODEL', str),
+        ('enable_compression', 'ENABLE_COMPRESSION', bool)
+    )
+    
     @classmethod
-    def from_env(cls) -> 'RetrievalSettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'RetrievalSettings':
         """从环境变量创建检索配置"""
-        return cls(
-            vector_similarity_threshold=float(os.getenv('VECTOR_SIMILARITY_THRESHOLD', '0.7')),
-            enable_rerank=os.getenv('ENABLE_RERANK', 'True').lower() == 'true',
-            rerank_model=os.getenv('RERANK_MODEL', 'bge-reranker-base'),
-            enable_compression=os.getenv('ENABLE_COMPRESSION', 'True').lower() == 'true'
-        )
+        return cls(**_env_kwargs(cls._ENV_SCHEMA, os.environ if env is None else env))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SecuritySettings:
     """安全配置"""
     enable_user_isolation: bool = True
@@ -176,191 +241,266 @@ class SecuritySettings:
     session_timeout: int = 3600  # 1小时
     max_query_rate: int = 100  # 每分钟最大查询次数
     
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('enable_user_isolation', 'ENABLE_USER_ISOLATION', bool),
+        ('enable_audit_log', 'ENABLE_AUDIT_LOG', bool),
+        ('session_timeout', 'SESSION_TIMEOUT', int),
+        ('max_query_rate', 'MAX_QUERY_RATE', int)
+    )
+    
     @classmethod
-    def from_env(cls) -> 'SecuritySettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'SecuritySettings':
         """从环境变量创建安全配置"""
-        return cls(
-            enable_user_isolation=os.getenv('ENABLE_USER_ISOLATION', 'True').lower() == 'true',
-            enable_audit_log=os.getenv('ENABLE_AUDIT_LOG', 'True').lower() == 'true',
-            session_timeout=int(os.getenv('SESSION_TIMEOUT', '3600')),
-            max_query_rate=int(os.getenv('MAX_QUERY_RATE', '100'))
-        )
+        return cls(**_env_kwargs(cls._ENV_SCHEMA, os.environ if env is None else env))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KnowledgeRAGSettings:
     """KnowledgeRAG主配置"""
-    database: DatabaseSettings = field(default_factory=DatabaseSettings)
-    milvus: MilvusSettings = field(default_factory=MilvusSettings)
-    object_store: ObjectStoreSettings = field(default_factory=ObjectStoreSettings)
-    embedding: EmbeddingSettings = field(default_factory=EmbeddingSettings)
-    token_budget: TokenBudgetSettings = field(default_factory=TokenBudgetSettings)
-    logging: LoggingSettings = field(default_factory=LoggingSettings)
-    retrieval: RetrievalSettings = field(default_factory=RetrievalSettings)
-    security: SecuritySettings = field(default_factory=SecuritySettings)
+    database: Optional[DatabaseSettings] = None
+    milvus: Optional[MilvusSettings] = None
+    object_store: Optional[ObjectStoreSettings] = None
+    embedding: Optional[EmbeddingSettings] = None
+    token_budget: Optional[TokenBudgetSettings] = None
+    logging: Optional[LoggingSettings] = None
+    retrieval: Optional[RetrievalSettings] = None
+    security: Optional[SecuritySettings] = None
     
     # 环境配置
     environment: str = "development"  # development, staging, production
     debug: bool = True
     
+    # 派生值缓存（配置不可变，首次调用时生成）
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _connection_string: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _milvus_uri: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _object_store_config: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    # (字段名, 环境变量名, 类型)
+    _ENV_SCHEMA = (
+        ('environment', 'ENVIRONMENT', str),
+        ('debug', 'DEBUG', bool)
+    )
+    
+    # (字段名, 子配置类型)，未传入时在 __post_init__ 中补默认值
+    _NESTED = (
+        ('database', DatabaseSettings),
+        ('milvus', MilvusSettings),
+        ('object_store', ObjectStoreSettings),
+        ('embedding', EmbeddingSettings),
+        ('token_budget', TokenBudgetSettings),
+        ('logging', LoggingSettings),
+        ('retrieval', RetrievalSettings),
+        ('security', SecuritySettings)
+    )
+    
+    def __post_init__(self):
+        # from_env 会传入全部子配置，只有直接构造时才需要创建默认值
+        for name, settings_cls in self._NESTED:
+            if getattr(self, name) is None:
+                object.__setattr__(self, name, settings_cls())
+    
     @classmethod
-    def from_env(cls) -> 'KnowledgeRAGSettings':
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'KnowledgeRAGSettings':
         """从环境变量创建完整配置"""
+        env = os.environ if env is None else env
         return cls(
-            database=DatabaseSettings.from_env(),
-            milvus=MilvusSettings.from_env(),
-            object_store=ObjectStoreSettings.from_env(),
-            embedding=EmbeddingSettings.from_env(),
-            token_budget=TokenBudgetSettings.from_env(),
-            logging=LoggingSettings.from_env(),
-            retrieval=RetrievalSettings.from_env(),
-            security=SecuritySettings.from_env(),
-            environment=os.getenv('ENVIRONMENT', 'development'),
-            debug=os.getenv('DEBUG', 'True').lower() == 'true'
+            database=DatabaseSettings.from_env(env),
+            milvus=MilvusSettings.from_env(env),
+            object_store=ObjectStoreSettings.from_env(env),
+            embedding=EmbeddingSettings.from_env(env),
+            token_budget=TokenBudgetSettings.from_env(env),
+            logging=LoggingSettings.from_env(env),
+            retrieval=RetrievalSettings.from_env(env),
+            security=SecuritySettings.from_env(env),
+            **_env_kwargs(cls._ENV_SCHEMA, env)
         )
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        import dataclasses
-        return dataclasses.asdict(self)
+        """转换为字典（结果缓存并共享，调用方请勿原地修改）"""
+        if self._dict_cache is None:
+            # 跳过以下划线开头的缓存字段
+            data = {}
+            for f in fields(self):
+                if f.name.startswith('_'):
+                    continue
+                value = getattr(self, f.name)
+                data[f.name] = asdict(value) if is_dataclass(value) else value
+            object.__setattr__(self, '_dict_cache', data)
+        return self._dict_cache
     
     def validate(self) -> bool:
-        """验证配置有效性"""
-        errors = []
-        
-        # 验证数据库配置
-        if not self.database.host:
-            errors.append("Database host is required")
+        """验证配置有效性（纯检查，不涉及文件系统）"""
+        errors = [message for check, message in _VALIDATORS if not check(self)]
         
-        if not (1 <= self.database.port <= 65535):
-            errors.append("Database port must be between 1 and 65535")
-        
-        # 验证Milvus配置
-        if not self.milvus.host:
-            errors.append("Milvus host is required")
-        
-        if not (1 <= self.milvus.port <= 65535):
-            errors.append("Milvus port must be between 1 and 65535")
-        
-        # 验证嵌入模型配置
-        if self.embedding.dimension <= 0:
-            errors.append("Embedding dimension must be positive")
-        
-        # 验证Token预算配置
-        if self.token_budget.max_context_tokens <= 0:
-            errors.append("Max context tokens must be positive")
-        
-        if self.token_budget.top_k_raw <= 0:
-            errors.append("Top K raw must be positive")
-        
-        # 验证对象存储配置
-        if self.object_store.type != "local":
-            errors.append("Only 'local' object store type is supported")
-        
-        # 验证本地对象存储路径
-        base_path = Path(self.object_store.base_path)
-        try:
-            if self.object_store.auto_create_dirs:
-                base_path.mkdir(parents=True, exist_ok=True)
-                # 创建实验目录
-                experiments_path = base_path / self.object_store.experiments_dir
-                experiments_path.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            errors.append(f"Cannot create object store directory: {e}")
+        if errors:
+            logger.error("Configuration validation failed: %s", errors)
+            return False
         
-        # 验证文件大小配置
-        if self.object_store.max_file_size <= 0:
-            errors.append("Max file size must be positive")
+        return True
+    
+    def ensure_filesystem(self) -> bool:
+        """创建所需目录：对象存储实验目录（auto_create_dirs 时）与日志目录"""
+        required_dirs = []
+        if self.object_store.auto_create_dirs:
+            base_path = Path(self.object_store.base_path)
+            required_dirs.append(("object store", base_path / self.object_store.experiments_dir))
+        required_dirs.append(("log", Path(self.logging.dir)))
         
-        # 验证日志配置
-        log_dir = Path(self.logging.dir)
-        try:
-            log_dir.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            errors.append(f"Cannot create log directory: {e}")
+        errors = []
+        for label, path in required_dirs:
+            # 目录已存在时跳过，避免重复的 mkdir 系统调用
+            if os.path.isdir(path):
+                continue
+            try:
+                os.makedirs(path, exist_ok=True)
+            except Exception as e:
+                errors.append(f"Cannot create {label} directory: {e}")
         
         if errors:
-            logger.error(f"Configuration validation failed: {errors}")
+            logger.error("Filesystem bootstrap failed: %s", errors)
             return False
-        
         return True
     
     def get_connection_string(self) -> str:
         """获取数据库连接字符串"""
-        return (f"mysql://{self.database.user}:{self.database.password}@"
-                f"{self.database.host}:{self.database.port}/{self.database.database}")
+        if self._connection_string is None:
+            object.__setattr__(self, '_connection_string', (
+                f"mysql://{self.database.user}:{self.database.password}@"
+                f"{self.database.host}:{self.database.port}/{self.database.database}"
+            ))
+        return self._connection_string
     
     def get_milvus_uri(self) -> str:
         """获取Milvus连接URI"""
-        return f"http://{self.milvus.host}:{self.milvus.port}"
+        if self._milvus_uri is None:
+            object.__setattr__(self, '_milvus_uri', f"http://{self.milvus.host}:{self.milvus.port}")
+        return self._milvus_uri
     
     def get_object_store_config(self) -> Dict[str, Any]:
-        """获取对象存储配置"""
-        if self.object_store.type == "local":
-            return {
+        """获取对象存储配置（每次返回新的字典，调用方可自由修改）"""
+        if self._object_store_config is None:
+            if self.object_store.type != "local":
+                raise ValueError(f"Unsupported object store type: {self.object_store.type}. Only 'local' is supported.")
+            object.__setattr__(self, '_object_store_config', {
                 "type": "local",
                 "base_path": self.object_store.base_path,
                 "experiments_dir": self.object_store.experiments_dir,
                 "auto_create_dirs": self.object_store.auto_create_dirs,
                 "max_file_size": self.object_store.max_file_size
-            }
-        else:
-            raise ValueError(f"Unsupported object store type: {self.object_store.type}. Only 'local' is supported.")
+            })
+        return dict(self._object_store_config)
+
+# 配置校验规则: (检查函数, 失败时的错误信息)
+_VALIDATORS: Tuple[Tuple[Callable[[KnowledgeRAGSettings], bool], str], ...] = (
+    # 数据库配置
+    (lambda s: bool(s.database.host), "Database host is required"),
+    (lambda s: 1 <= s.database.port <= 65535, "Database port must be between 1 and 65535"),
+    # Milvus配置
+    (lambda s: bool(s.milvus.host), "Milvus host is required"),
+    (lambda s: 1 <= s.milvus.port <= 65535, "Milvus port must be between 1 and 65535"),
+    # 嵌入模型配置
+    (lambda s: s.embedding.dimension > 0, "Embedding dimension must be positive"),
+    # Token预算配置
+    (lambda s: s.token_budget.max_context_tokens > 0, "Max context tokens must be positive"),
+    (lambda s: s.token_budget.top_k_raw > 0, "Top K raw must be positive"),
+    # 对象存储配置
+    (lambda s: s.object_store.type == "local", "Only 'local' object store type is supported"),
+    (lambda s: s.object_store.max_file_size > 0, "Max file size must be positive")
+)
 
-# 全局配置实例
+# 各子配置的模块级引用，配置构建后绑定，快捷访问函数直接返回
+db_settings: Optional[DatabaseSettings] = None
+milvus_settings: Optional[MilvusSettings] = None
+object_store_settings: Optional[ObjectStoreSettings] = None
+embedding_settings: Optional[EmbeddingSettings] = None
+token_budget_settings: Optional[TokenBudgetSettings] = None
+logging_settings: Optional[LoggingSettings] = None
+retrieval_settings: Optional[RetrievalSettings] = None
+security_settings: Optional[SecuritySettings] = None
+
+# 已构建的全局配置；构建锁保证并发首次访问时配置只构建、校验一次
 _settings: Optional[KnowledgeRAGSettings] = None
+_settings_lock = threading.Lock()
+
+def _build_settings() -> KnowledgeRAGSettings:
+    """从环境变量构建并验证配置"""
+    _ensure_dotenv()
+    settings = KnowledgeRAGSettings.from_env()
+    
+    # 验证配置并创建所需目录（部署环境已保证配置与目录就绪时，可设置 KNOWLEDGE_RAG_SKIP_VALIDATE 跳过）
+    if not _as_bool(os.environ.get('KNOWLEDGE_RAG_SKIP_VALIDATE', '')):
+        if not settings.validate():
+            raise ValueError("Invalid configuration")
+        if not settings.ensure_filesystem():
+            raise ValueError("Cannot prepare configured directories")
+    
+    logger.info("Configuration loaded: environment=%s, debug=%s", settings.environment, settings.debug)
+    
+    # 绑定模块级子配置引用
+    globals().update(
+        db_settings=settings.database,
+        milvus_settings=settings.milvus,
+        object_store_settings=settings.object_store,
+        embedding_settings=settings.embedding,
+        token_budget_settings=settings.token_budget,
+        logging_settings=settings.logging,
+        retrieval_settings=settings.retrieval,
+        security_settings=settings.security
+    )
+    return settings
 
 def get_settings() -> KnowledgeRAGSettings:
-    """获取全局配置实例"""
+    """获取全局配置实例（已构建时直接返回，不加锁）"""
     global _settings
-    if _settings is None:
-        _settings = KnowledgeRAGSettings.from_env()
-        
-        # 验证配置
-        if not _settings.validate():
-            raise ValueError("Invalid configuration")
-        
-        logger.info(f"Configuration loaded: environment={_settings.environment}, debug={_settings.debug}")
+    settings = _settings
+    if settings is not None:
+        return settings
     
-    return _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = _build_settings()
+        return _settings
 
 def reload_settings():
     """重新加载配置"""
     global _settings
-    _settings = None
-    return get_settings()
+    with _settings_lock:
+        _settings = _build_settings()
+        return _settings
 
 # 快捷访问函数
 def get_db_settings() -> DatabaseSettings:
     """获取数据库配置"""
-    return get_settings().database
+    return db_settings or get_settings().database
 
 def get_milvus_settings() -> MilvusSettings:
     """获取Milvus配置"""
-    return get_settings().milvus
+    return milvus_settings or get_settings().milvus
 
 def get_object_store_settings() -> ObjectStoreSettings:
     """获取对象存储配置"""
-    return get_settings().object_store
+    return object_store_settings or get_settings().object_store
 
 def get_embedding_settings() -> EmbeddingSettings:
     """获取嵌入模型配置"""
-    return get_settings().embedding
+    return embedding_settings or get_settings().embedding
 
 def get_token_budget_settings() -> TokenBudgetSettings:
     """获取Token预算配置"""
-    return get_settings().token_budget
+    return token_budget_settings or get_settings().token_budget
 
 def get_logging_settings() -> LoggingSettings:
     """获取日志配置"""
-    return get_settings().logging
+    return logging_settings or get_settings().logging
 
 def get_retrieval_settings() -> RetrievalSettings:
     """获取检索配置"""
-    return get_settings().retrieval
+    return retrieval_settings or get_settings().retrieval
 
 def get_security_settings() -> SecuritySettings:
     """获取安全配置"""
-    return get_settings().security
+    return security_settings or get_settings().security
 
 def is_debug() -> bool:
     """是否为调试模式"""
@@ -373,13 +513,13 @@ def is_production() -> bool:
 def print_config():
     """打印配置信息（隐藏敏感信息）"""
     settings = get_settings()
-    config_dict = settings.to_dict()
+    # to_dict 返回共享缓存，脱敏在浅拷贝上进行
+    config_dict = dict(settings.to_dict())
     
     # 隐藏敏感信息
     if 'database' in config_dict:
-        config_dict['database']['password'] = "***"
+        config_dict['database'] = {**config_dict['database'], 'password': "***"}
     
-    import json
     print(json.dumps(config_dict, indent=2, ensure_ascii=False))
 
 if __name__ == "__main__":
@@ -4,19 +4,202 @@ KnowledgeRAG 灵活搜索工具
 用途: 支持动态查询不同表结构，适合实验环境
 """
 
+import os
 import json
+import sqlite3
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass
-from datetime import datetime
+import heapq
+import functools
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Union
+from dataclasses import dataclass, replace
+from time import monotonic, perf_counter_ns
 import numpy as np
+from mysql.connector.errors import PoolError
 
 from .mysql_client import get_mysql_client
 from .milvus_client import get_milvus_client
 from .logging_utils import get_logger, LogLevel, LogCategory
 
+import sqlglot
+from sqlglot import exp as sql_exp
+from sqlglot.errors import ParseError
+
 logger = logging.getLogger(__name__)
 
+# 查询向量缓存容量
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# 查询向量持久化缓存（SQLite）路径，设置为空字符串可关闭
+EMBED_CACHE_DB = os.getenv('KNOWLEDGE_RAG_EMBED_CACHE_DB', os.path.expanduser('~/.knowledge_rag/embed_cache.db'))
+
+class _QueryEmbeddingCache:
+    """查询向量缓存（LRU，线程安全）：按模型名与规范化查询文本的 SHA-256 精确命中，同时持久化到 SQLite
+    
+    只做精确匹配：仅大小写与空白不同的查询视为同一查询，措辞不同的查询不会复用向量
+    """
+    
+    def __init__(self, maxsize: int = QUERY_EMBEDDING_CACHE_SIZE, db_path: Optional[str] = EMBED_CACHE_DB):
+        self.maxsize = maxsize
+        self.db_path = db_path
+        # key -> 向量
+        self._entries: OrderedDict = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _normalize(query_text: str) -> str:
+        """规范化查询文本：小写并合并空白"""
+        return ' '.join(query_text.lower().split())
+    
+    @classmethod
+    def _key(cls, query_text: str, model: str) -> str:
+        """缓存键：模型名与规范化文本的 SHA-256"""
+        return hashlib.sha256(f"{model}\n{cls._normalize(query_text)}".encode('utf-8')).hexdigest()
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """首次使用时打开持久化缓存，失败则只使用内存缓存（需持有锁）"""
+        if self._db is None and self.db_path:
+            try:
+                os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+                db = sqlite3.connect(self.db_path, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute("CREATE TABLE IF NOT EXISTS qcache (q_hash TEXT PRIMARY KEY, embedding BLOB NOT NULL)")
+                self._db = db
+            except sqlite3.Error as e:
+                logger.warning(f"查询向量持久化缓存不可用，仅使用内存缓存: {e}")
+                self.db_path = None
+        return self._db
+    
+    def _insert(self, key: str, vector: np.ndarray):
+        """写入内存缓存并淘汰最久未使用的条目（需持有锁）"""
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def get(self, query_text: str, model: str = '') -> Optional[np.ndarray]:
+        """查找缓存向量，未命中返回 None"""
+        key = self._key(query_text, model)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                return vector
+            
+            # 持久化缓存命中，载入内存
+            db = self._connect()
+            if db is not None:
+                row = db.execute("SELECT embedding FROM qcache WHERE q_hash = ?", (key,)).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32)
+                    self._insert(key, vector)
+                    return vector
+        return None
+    
+    def put(self, query_text: str, vector, model: str = '') -> np.ndarray:
+        """写入缓存，返回缓存中的向量"""
+        key = self._key(query_text, model)
+        vector = np.asarray(vector, dtype=np.float32)
+        
+        with self._lock:
+            self._insert(key, vector)
+            db = self._connect()
+            if db is not None:
+                try:
+                    with db:
+                        db.execute("INSERT OR REPLACE INTO qcache (q_hash, embedding) VALUES (?, ?)",
+                                   (key, vector.tobytes()))
+                except sqlite3.Error as e:
+                    logger.warning(f"查询向量持久化失败: {e}")
+        return vector
+    
+    def clear(self):
+        """清空内存缓存（持久化缓存保留）"""
+        with self._lock:
+            self._entries.clear()
+
+# 全局查询向量缓存
+_query_embedding_cache = _QueryEmbeddingCache()
+
+# 线程独立的随机数生成器（模拟向量用，避免全局RNG加锁）
+_thread_rng = threading.local()
+
+# 并发检索线程数：所有搜索引擎共享同一线程池，每个线程同时最多占用一个MySQL连接。
+# 连接池为整个进程共享，其他调用方同时占用连接时，MySQLClient.get_connection()
+# 会排队等待空闲连接（见 mysql_client.POOL_CHECKOUT_TIMEOUT），不会直接失败
+SEARCH_WORKERS = 8
+
+_search_executor: Optional[ThreadPoolExecutor] = None
+_search_executor_lock = threading.Lock()
+
+def _get_search_executor() -> ThreadPoolExecutor:
+    """获取进程内共享的检索线程池（首次使用时创建）"""
+    global _search_executor
+    if _search_executor is None:
+        with _search_executor_lock:
+            if _search_executor is None:
+                _search_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix='flexible_search')
+    return _search_executor
+
+# 表列表缓存有效期（秒）
+TABLES_CACHE_TTL = 30
+
+# 自定义搜索每批读取的行数
+FETCH_BATCH_SIZE = 1000
+
+# 混合搜索倒数排名融合常数
+RRF_K = 60
+
+# 内容字段优先级：text > content > title > name
+CONTENT_FIELDS = ('text', 'content', 'title', 'name')
+
+# BM25 参数
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+@functools.lru_cache(maxsize=256)
+def _query_terms(query_text: str) -> Tuple[str, ...]:
+    """查询分词（小写、去重并保持顺序）"""
+    return tuple(dict.fromkeys(query_text.lower().split()))
+
+def _limit_custom_sql(custom_sql: str, top_k: int) -> str:
+    """校验自定义SQL为单条只读查询，并将 LIMIT 限制在 top_k 以内"""
+    try:
+        tree = sqlglot.parse_one(custom_sql, read='mysql')
+    except ParseError as e:
+        raise ValueError(f"无法解析自定义SQL: {e}") from e
+    
+    # WITH ... DELETE/UPDATE、多条语句等都不是 Select/Union
+    if not isinstance(tree, (sql_exp.Select, sql_exp.Union)):
+        raise ValueError("自定义搜索只支持SELECT查询")
+    
+    limit = tree.args.get('limit')
+    current = limit.expression if limit is not None else None
+    if not (isinstance(current, sql_exp.Literal) and current.is_int and int(current.this) <= top_k):
+        tree.set('limit', sql_exp.Limit(expression=sql_exp.Literal.number(top_k)))
+    return tree.sql(dialect='mysql')
+
+def _stream_rows(cursor, batch_size: int = FETCH_BATCH_SIZE):
+    """按批读取游标结果，逐行返回"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+def _reciprocal_rank_fusion(rank_lists: List[List[Any]], k: int = RRF_K) -> Dict[Any, float]:
+    """倒数排名融合：score = sum(1 / (k + rank))，rank 从1开始"""
+    scores: Dict[Any, float] = {}
+    for rank_list in rank_lists:
+        for rank, doc_id in enumerate(rank_list, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
 @dataclass
 class SearchQuery:
     """搜索查询数据类"""
@@ -27,6 +210,7 @@ class SearchQuery:
     threshold: float = 0.7
     experiment_name: Optional[str] = None
     table_mapping: Optional[Dict[str, str]] = None  # 自定义表映射
+    query_vector: Optional[np.ndarray] = None  # 预先计算的查询向量，提供时语义搜索不再计算
 
 @dataclass
 class SearchResult:
@@ -46,6 +230,13 @@ class FlexibleSearchEngine:
         self.milvus_client = None
         self.logger = get_logger()
         
+        # 表名 -> FULLTEXT索引列
+        self._fulltext_columns: Dict[str, Tuple[str, ...]] = {}
+        # (表名, 过滤字段) -> 表搜索SQL
+        self._sql_cache: Dict[Tuple[str, Tuple[str, ...]], Optional[Tuple[str, int, bool]]] = {}
+        # (获取时间, 表名列表)
+        self._tables_cache: Optional[Tuple[float, List[str]]] = None
+        
         # 尝试连接Milvus
         try:
             self.milvus_client = get_milvus_client()
@@ -64,10 +255,12 @@ class FlexibleSearchEngine:
         """设置实验环境"""
         self.experiment_name = experiment_name
         # 更新数据库连接
-        import os
         os.environ['MYSQL_DB'] = f"knowledge_rag_{experiment_name}"
         # 重新获取客户端
         self.mysql_client = get_mysql_client()
+        self._fulltext_columns.clear()
+        self._sql_cache.clear()
+        self._tables_cache = None
     
     def search(self, query: SearchQuery) -> List[SearchResult]:
         """执行搜索"""
@@ -104,7 +297,9 @@ class FlexibleSearchEngine:
         # 1. 向量搜索
         try:
             # 这里需要embedding模型，先用模拟数据
-            query_vector = self._get_query_embedding(query.query_text)
+            query_vector = query.query_vector
+            if query_vector is None:
+                query_vector = self._get_query_embedding(query.query_text)
             
             # 搜索向量
             vector_results = self.milvus_client.search(
@@ -113,9 +308,10 @@ class FlexibleSearchEngine:
                 user_id=query.filters.get('user_id') if query.filters else None
             )
             
-            # 获取对应的文本内容
+            # 一次查询获取全部对应的文本内容
+            contents = self._get_contents_by_chunk_ids([result.chunk_uid for result in vector_results])
             for result in vector_results:
-                content = self._get_content_by_chunk_id(result.chunk_uid)
+                content = contents.get(result.chunk_uid)
                 if content:
                     results.append(SearchResult(
                         id=result.chunk_uid,
@@ -143,84 +339,97 @@ class FlexibleSearchEngine:
             table_mapping = query.table_mapping or self.default_table_mapping
             
             # 检查表是否存在
-            tables = self.mysql_client.list_tables()
+            tables = self._list_tables()
             available_tables = [t for t in table_mapping.values() if t in tables]
             
             if not available_tables:
                 logger.warning(f"没有找到可搜索的表: {available_tables}")
                 return results
             
-            # 在每个表中搜索
-            for table_name in available_tables:
-                table_results = self._search_in_table(
-                    table_name, 
-                    query.query_text, 
+            # 在每个表中通过共享线程池并发搜索（各自从连接池获取连接，I/O期间释放GIL）
+            table_results_list = list(_get_search_executor().map(
+                lambda table_name: self._search_in_table(
+                    table_name,
+                    query.query_text,
                     query.filters,
                     query.top_k
-                )
-                results.extend(table_results)
+                ),
+                available_tables
+            ))
         
         except Exception as e:
             logger.error(f"关键词搜索失败: {e}")
-        
-        # 按相关性排序
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:query.top_k]
+            return results
+        
+        # 各表分数量纲不同（FULLTEXT相关性与按本表结果计算的BM25），
+        # 表内按分数排序后用倒数排名融合合并，不直接比较原始分数；
+        # 以 (表序号, 表内位置) 标识结果，不同表的同一id、无id列的行都分别保留
+        representatives: Dict[Tuple[int, int], SearchResult] = {}
+        rank_lists = []
+        for table_index, table_results in enumerate(table_results_list):
+            table_results.sort(key=lambda x: x.score, reverse=True)
+            keys = [(table_index, position) for position in range(len(table_results))]
+            representatives.update(zip(keys, table_results))
+            rank_lists.append(keys)
+        
+        scores = _reciprocal_rank_fusion(rank_lists)
+        top = heapq.nlargest(query.top_k, scores.items(), key=lambda item: item[1])
+        return [replace(representatives[key], score=score) for key, score in top]
     
     def _hybrid_search(self, query: SearchQuery) -> List[SearchResult]:
         """混合搜索"""
-        # 分别执行语义搜索和关键词搜索
-        semantic_results = self._semantic_search(query)
-        keyword_results = self._keyword_search(query)
-        
-        # 合并结果
-        combined_results = {}
-        
-        # 添加语义搜索结果（权重0.6）
-        for result in semantic_results:
-            combined_results[result.id] = result
-            result.score *= 0.6
-        
-        # 添加关键词搜索结果（权重0.4）
-        for result in keyword_results:
-            if result.id in combined_results:
-                # 合并分数
-                combined_results[result.id].score += result.score * 0.4
-            else:
-                result.score *= 0.4
-                combined_results[result.id] = result
-        
-        # 排序并返回
-        results = list(combined_results.values())
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:query.top_k]
+        # 语义搜索提交到线程池，与当前线程中的关键词搜索并发执行
+        # （Milvus不可用时语义搜索会回退到关键词搜索，此时直接串行执行）
+        if self.milvus_client:
+            semantic_future = _get_search_executor().submit(self._semantic_search, query)
+            keyword_results = self._keyword_search(query)
+            semantic_results = semantic_future.result()
+        else:
+            semantic_results = self._semantic_search(query)
+            keyword_results = self._keyword_search(query)
+        
+        # 倒数排名融合（RRF）：按两路结果中的排名计分，不受两种分数量纲不同的影响
+        # 同一id优先保留语义结果的内容与元数据
+        representatives: Dict[str, SearchResult] = {}
+        for result in semantic_results + keyword_results:
+            representatives.setdefault(result.id, result)
+        
+        scores = _reciprocal_rank_fusion([
+            [result.id for result in semantic_results],
+            [result.id for result in keyword_results]
+        ])
+        top = heapq.nlargest(query.top_k, scores.items(), key=lambda item: item[1])
+        return [replace(representatives[result_id], score=score) for result_id, score in top]
     
     def _custom_search(self, query: SearchQuery) -> List[SearchResult]:
         """自定义搜索"""
         if not query.filters or 'custom_sql' not in query.filters:
             raise ValueError("自定义搜索需要提供custom_sql")
         
+        # 由数据库完成 top_k 截断
+        custom_sql = _limit_custom_sql(query.filters['custom_sql'], query.top_k)
+        
         results = []
         
         try:
             with self.mysql_client.get_connection() as conn:
-                cursor = conn.cursor(dictionary=True)
+                cursor = conn.cursor(buffered=False)
                 
                 # 执行自定义SQL
-                custom_sql = query.filters['custom_sql']
                 cursor.execute(custom_sql)
-                rows = cursor.fetchall()
                 
-                # 转换为搜索结果
-                for i, row in enumerate(rows):
-                    # 尝试自动检测内容字段
-                    content = self._extract_content_from_row(row)
-                    
+                # 列下标只计算一次，尝试自动检测内容字段
+                columns = cursor.column_names
+                content_indexes = self._content_indexes(columns)
+                id_index = columns.index('id') if 'id' in columns else -1
+                
+                # 分批流式读取（SQL 已限制为最多 top_k 行，读完即可归还连接）
+                for i, row in enumerate(_stream_rows(cursor)):
                     results.append(SearchResult(
-                        id=str(row.get('id', i)),
+                        id=str(row[id_index] if id_index >= 0 else i),
                         score=1.0,  # 自定义搜索不计算相关性
-                        content=content,
-                        metadata=row,
+                        content=self._extract_content(row, content_indexes),
+                        metadata=dict(zip(columns, row)),
                         source='custom_sql'
                     ))
                 
@@ -231,133 +440,236 @@ class FlexibleSearchEngine:
         
         return results
     
+    def _list_tables(self) -> List[str]:
+        """获取当前数据库的表名列表（缓存 TABLES_CACHE_TTL 秒，切换实验时失效）"""
+        now = monotonic()
+        cached = self._tables_cache
+        if cached is not None and now - cached[0] < TABLES_CACHE_TTL:
+            return cached[1]
+        tables = self.mysql_client.list_tables()
+        self._tables_cache = (now, tables)
+        return tables
+    
     def _search_in_table(self, table_name: str, query_text: str, 
                         filters: Optional[Dict], top_k: int) -> List[SearchResult]:
-        """在指定表中搜索"""
+        """在指定表中搜索（有FULLTEXT索引时由MySQL计算相关性，否则LIKE匹配后计算BM25）"""
         results = []
         
         try:
             with self.mysql_client.get_connection() as conn:
-                cursor = conn.cursor(dictionary=True)
+                cursor = conn.cursor()
                 
-                # 获取表结构
-                cursor.execute(f"DESCRIBE {table_name}")
-                columns = cursor.fetchall()
+                # 过滤条件（user_id特殊处理），按字段名排序以匹配缓存的SQL
+                filter_items = sorted((key, value) for key, value in (filters or {}).items() if key != 'user_id')
+                filter_keys = tuple(key for key, _ in filter_items)
                 
-                # 找到文本字段
-                text_columns = []
-                for col in columns:
-                    col_type = col['Type'].lower()
-                    if any(t in col_type for t in ['text', 'varchar', 'char']):
-                        text_columns.append(col['Field'])
+                # 同一表、同一组过滤字段的SQL只生成一次
+                cache_key = (table_name, filter_keys)
+                if cache_key not in self._sql_cache:
+                    self._sql_cache[cache_key] = self._build_table_search_sql(conn, table_name, filter_keys)
+                plan = self._sql_cache[cache_key]
                 
-                if not text_columns:
+                if plan is None:
                     return results
-                
-                # 构建搜索SQL
-                search_conditions = []
-                for col in text_columns:
-                    search_conditions.append(f"{col} LIKE %s")
-                
-                where_clause = " OR ".join(search_conditions)
-                
-                # 添加过滤条件
-                if filters:
-                    for key, value in filters.items():
-                        if key != 'user_id':  # user_id特殊处理
-                            where_clause += f" AND {key} = %s"
-                
-                sql = f"SELECT * FROM {table_name} WHERE {where_clause} LIMIT %s"
+                sql, query_param_count, fulltext = plan
                 
                 # 准备参数
-                params = [f"%{query_text}%"] * len(text_columns)
-                if filters:
-                    for key, value in filters.items():
-                        if key != 'user_id':
-                            params.append(value)
+                query_param = query_text if fulltext else f"%{query_text}%"
+                params = [query_param] * query_param_count
+                params.extend(value for _, value in filter_items)
                 params.append(top_k)
                 
                 cursor.execute(sql, params)
                 rows = cursor.fetchall()
+                columns = cursor.column_names
+                
+                if fulltext:
+                    # _score 为最后一列，直接使用MySQL相关性分数
+                    columns = columns[:-1]
+                    scores = [float(row[-1]) for row in rows]
+                    rows = [row[:-1] for row in rows]
+                
+                # 列下标只计算一次
+                content_indexes = self._content_indexes(columns)
+                id_index = columns.index('id') if 'id' in columns else -1
+                contents = [self._extract_content(row, content_indexes) for row in rows]
+                
+                if not fulltext:
+                    # 整批计算 BM25 分数
+                    scores = self._score_bm25(query_text, contents)
                 
                 # 转换为搜索结果
-                for row in rows:
-                    content = self._extract_content_from_row(row)
-                    score = self._calculate_text_similarity(query_text, content)
-                    
+                for row, content, score in zip(rows, contents, scores):
                     results.append(SearchResult(
-                        id=str(row.get('id', '')),
-                        score=score,
+                        id=str(row[id_index]) if id_index >= 0 else '',
+                        score=float(score),
                         content=content,
-                        metadata=row,
+                        metadata=dict(zip(columns, row)),
                         source=table_name
                     ))
                 
                 cursor.close()
         
+        except PoolError as e:
+            # 连接池等待超时，该表结果缺失，单独记录以便与SQL错误区分
+            logger.error(f"表搜索失败 {table_name}: MySQL连接池已耗尽，本次结果不包含该表: {e}")
         except Exception as e:
             logger.error(f"表搜索失败 {table_name}: {e}")
         
         return results
     
-    def _get_query_embedding(self, query_text: str) -> List[float]:
-        """获取查询向量（模拟）"""
+    def _build_table_search_sql(self, conn, table_name: str,
+                                filter_keys: Tuple[str, ...]) -> Optional[Tuple[str, int, bool]]:
+        """生成表搜索SQL，返回 (SQL, 查询参数个数, 是否FULLTEXT)；表中没有文本字段时返回 None"""
+        filter_clause = "".join(f" AND {key} = %s" for key in filter_keys)
+        cursor = conn.cursor(dictionary=True)
+        
+        fulltext_columns = self._get_fulltext_columns(cursor, table_name)
+        if fulltext_columns:
+            cursor.close()
+            match_expr = f"MATCH({', '.join(fulltext_columns)}) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+            sql = (f"SELECT *, {match_expr} AS _score FROM {table_name} "
+                   f"WHERE {match_expr}{filter_clause} ORDER BY _score DESC LIMIT %s")
+            return sql, 2, True
+        
+        # 获取表结构，找到文本字段
+        cursor.execute(f"DESCRIBE {table_name}")
+        text_columns = []
+        for col in cursor.fetchall():
+            col_type = col['Type'].lower()
+            if any(t in col_type for t in ['text', 'varchar', 'char']):
+                text_columns.append(col['Field'])
+        cursor.close()
+        
+        if not text_columns:
+            return None
+        
+        like_clause = " OR ".join(f"{col} LIKE %s" for col in text_columns)
+        sql = f"SELECT * FROM {table_name} WHERE ({like_clause}){filter_clause} LIMIT %s"
+        return sql, len(text_columns), False
+    
+    def _get_fulltext_columns(self, cursor, table_name: str) -> Tuple[str, ...]:
+        """获取表的FULLTEXT索引列（首次查询后缓存，无索引时为空元组）"""
+        columns = self._fulltext_columns.get(table_name)
+        if columns is None:
+            cursor.execute(f"SHOW INDEX FROM {table_name} WHERE Index_type = 'FULLTEXT'")
+            indexes: Dict[str, List[Tuple[int, str]]] = {}
+            for row in cursor.fetchall():
+                indexes.setdefault(row['Key_name'], []).append((row['Seq_in_index'], row['Column_name']))
+            
+            # MATCH() 的列必须与某个FULLTEXT索引完全一致，取列数最多的索引
+            best = max(indexes.values(), key=len, default=[])
+            columns = tuple(name for _, name in sorted(best))
+            self._fulltext_columns[table_name] = columns
+        return columns
+    
+    def _get_query_embedding(self, query_text: str) -> np.ndarray:
+        """获取查询向量（优先读取缓存）"""
+        from ..config import get_embedding_settings
+        model = get_embedding_settings().model_name
+        vector = _query_embedding_cache.get(query_text, model)
+        if vector is None:
+            vector = _query_embedding_cache.put(query_text, self._compute_query_embedding(query_text), model)
+        return vector
+    
+    def _get_query_embeddings_batch(self, query_texts: List[str]) -> List[np.ndarray]:
+        """批量获取查询向量：缓存未命中的查询合并为一次模型调用"""
+        from ..config import get_embedding_settings
+        model = get_embedding_settings().model_name
+        
+        vectors = {text: _query_embedding_cache.get(text, model) for text in dict.fromkeys(query_texts)}
+        misses = [text for text, vector in vectors.items() if vector is None]
+        if misses:
+            for text, vector in zip(misses, self._compute_query_embeddings(misses)):
+                vectors[text] = _query_embedding_cache.put(text, vector, model)
+        return [vectors[text] for text in query_texts]
+    
+    def _compute_query_embeddings(self, query_texts: List[str]) -> List[np.ndarray]:
+        """批量计算查询向量（接入支持批量输入的模型时覆盖此方法）"""
+        return [self._compute_query_embedding(text) for text in query_texts]
+    
+    def _compute_query_embedding(self, query_text: str) -> np.ndarray:
+        """计算查询向量（模拟）"""
         raise NotImplementedError("Not implemented, please implement this function in your own code.")
         # 这里应该调用真实的embedding模型
-        # 现在返回随机向量作为示例，维度与配置一致
+        # 现在返回随机向量作为示例，维度与配置一致（float32 ndarray，直接传给Milvus）
         from ..config import get_embedding_settings
         embedding_settings = get_embedding_settings()
-        return np.random.random(embedding_settings.dimension).tolist()
+        rng = getattr(_thread_rng, 'generator', None)
+        if rng is None:
+            rng = _thread_rng.generator = np.random.default_rng()
+        return rng.standard_normal(embedding_settings.dimension, dtype=np.float32)
     
-    def _get_content_by_chunk_id(self, chunk_uid: str) -> Optional[str]:
-        """根据chunk_uid获取内容"""
+    def _get_contents_by_chunk_ids(self, chunk_uids: List[str]) -> Dict[str, str]:
+        """根据chunk_uid批量获取内容，返回 chunk_uid -> text"""
+        if not chunk_uids:
+            return {}
+        
         try:
             with self.mysql_client.get_connection() as conn:
-                cursor = conn.cursor(dictionary=True)
+                cursor = conn.cursor()
                 
-                # 尝试从chunks表获取
-                cursor.execute("SELECT text FROM chunks WHERE chunk_uid = %s", (chunk_uid,))
-                row = cursor.fetchone()
-                
-                if row:
-                    return row['text']
+                # 从chunks表一次性获取
+                placeholders = ", ".join(["%s"] * len(chunk_uids))
+                cursor.execute(
+                    f"SELECT chunk_uid, text FROM chunks WHERE chunk_uid IN ({placeholders})",
+                    list(chunk_uids)
+                )
+                contents = dict(cursor.fetchall())
                 
                 cursor.close()
+                return contents
+        except PoolError as e:
+            logger.error(f"获取chunk内容失败: MySQL连接池已耗尽，语义结果将缺少内容: {e}")
         except Exception as e:
             logger.error(f"获取chunk内容失败: {e}")
         
-        return None
+        return {}
+    
+    @staticmethod
+    def _content_indexes(columns: Tuple[str, ...]) -> List[int]:
+        """按优先级返回内容字段的列下标"""
+        return [columns.index(field) for field in CONTENT_FIELDS if field in columns]
     
-    def _extract_content_from_row(self, row: Dict) -> str:
+    def _extract_content(self, row: Tuple, content_indexes: List[int]) -> str:
         """从行数据中提取内容"""
-        # 优先级：text > content > title > name
-        for field in ['text', 'content', 'title', 'name']:
-            if field in row and row[field]:
-                return str(row[field])
+        for i in content_indexes:
+            if row[i]:
+                return str(row[i])
         
         # 如果没有明显的内容字段，返回所有字段的拼接
-        return " ".join(str(v) for v in row.values() if v)
+        return " ".join(str(v) for v in row if v)
     
-    def _calculate_text_similarity(self, query: str, text: str) -> float:
-        """计算文本相似度（简单实现）"""
-        if not query or not text:
-            return 0.0
-        
-        query_words = set(query.lower().split())
-        text_words = set(text.lower().split())
-        
-        if not query_words:
-            return 0.0
-        
-        intersection = query_words.intersection(text_words)
-        return len(intersection) / len(query_words)
+    def _score_bm25(self, query_text: str, contents: List[str]) -> np.ndarray:
+        """计算一批文本的 BM25 分数（IDF 按本批文本统计，返回原始分数）"""
+        terms = _query_terms(query_text)
+        if not terms or not contents:
+            return np.zeros(len(contents), dtype=np.float32)
+        
+        # 只统计查询词的词频矩阵 (文本数, 查询词数)
+        term_index = {term: j for j, term in enumerate(terms)}
+        tf = np.zeros((len(contents), len(terms)), dtype=np.float32)
+        doc_len = np.empty(len(contents), dtype=np.float32)
+        for i, content in enumerate(contents):
+            tokens = content.lower().split()
+            doc_len[i] = len(tokens)
+            for token in tokens:
+                j = term_index.get(token)
+                if j is not None:
+                    tf[i, j] += 1
+        
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((len(contents) - df + 0.5) / (df + 0.5))
+        avgdl = doc_len.mean() or 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avgdl)
+        return (tf * (BM25_K1 + 1) / (tf + norm[:, None])) @ idf
     
     def explain_search(self, query: SearchQuery) -> Dict[str, Any]:
         """解释搜索策略"""
         explanation = {
             'query_type': query.query_type,
             'experiment': self.experiment_name,
-            'available_tables': self.mysql_client.list_tables(),
+            'available_tables': self._list_tables(),
             'milvus_available': self.milvus_client is not None,
             'strategy': ''
         }
@@ -370,7 +682,7 @@ class FlexibleSearchEngine:
         elif query.query_type == "keyword":
             explanation['strategy'] = 'Full-text search across all text columns'
         elif query.query_type == "hybrid":
-            explanation['strategy'] = 'Semantic (60%) + Keyword (40%) combined search'
+            explanation['strategy'] = 'Semantic + Keyword combined search (reciprocal rank fusion)'
         elif query.query_type == "custom":
             explanation['strategy'] = 'Custom SQL execution'
         
@@ -392,36 +704,53 @@ class ExperimentSearchAnalyzer:
         
         results = {}
         
+        # 重复查询只执行一次，统计时按出现次数加权
+        occurrences = Counter(queries)
+        unique_queries = list(occurrences)
+        duplicate_ratio = 1 - len(unique_queries) / len(queries) if queries else 0.0
+        
+        # 第一阶段：语义/混合搜索所需的查询向量一次性批量获取
+        query_vectors = {}
+        if self.search_engine.milvus_client and {"semantic", "hybrid"} & set(query_types):
+            try:
+                query_vectors = dict(zip(unique_queries, self.search_engine._get_query_embeddings_batch(unique_queries)))
+            except Exception as e:
+                logger.error(f"批量获取查询向量失败: {e}")
+        
+        # 第二阶段：逐条执行并计时
+        search = self.search_engine.search
         for query_type in query_types:
             type_results = {
                 'total_queries': 0,
                 'total_time': 0,
                 'avg_time': 0,
                 'avg_results': 0,
-                'errors': 0
+                'errors': 0,
+                'unique_queries': len(unique_queries),
+                'duplicate_ratio': duplicate_ratio
             }
             
-            for query_text in queries:
+            for query_text, count in occurrences.items():
                 try:
-                    start_time = datetime.now()
+                    start_ns = perf_counter_ns()
                     
                     search_query = SearchQuery(
                         query_text=query_text,
                         query_type=query_type,
-                        top_k=10
+                        top_k=10,
+                        query_vector=query_vectors.get(query_text)
                     )
                     
-                    search_results = self.search_engine.search(search_query)
+                    search_results = search(search_query)
                     
-                    end_time = datetime.now()
-                    duration = (end_time - start_time).total_seconds() * 1000
+                    duration = (perf_counter_ns() - start_ns) / 1e6
                     
-                    type_results['total_queries'] += 1
-                    type_results['total_time'] += duration
-                    type_results['avg_results'] += len(search_results)
+                    type_results['total_queries'] += count
+                    type_results['total_time'] += duration * count
+                    type_results['avg_results'] += len(search_results) * count
                     
                 except Exception as e:
-                    type_results['errors'] += 1
+                    type_results['errors'] += count
                     logger.error(f"搜索分析失败: {e}")
             
             if type_results['total_queries'] > 0:
@@ -440,6 +769,8 @@ class ExperimentSearchAnalyzer:
         for query_type, results in analysis_results.items():
             report += f"搜索类型: {query_type}\n"
             report += f"  查询总数: {results['total_queries']}\n"
+            report += f"  去重查询数: {results['unique_queries']}\n"
+            report += f"  重复率: {results['duplicate_ratio']:.1%}\n"
             report += f"  平均耗时: {results['avg_time']:.2f}ms\n"
             report += f"  平均结果数: {results['avg_results']:.1f}\n"
             report += f"  错误次数: {results['errors']}\n"
@@ -479,11 +810,9 @@ def main():
     
     # 执行搜索
     try:
-        start_time = datetime.now()
+        start_ns = perf_counter_ns()
         results = search_engine.search(search_query)
-        end_time = datetime.now()
-        
-        duration = (end_time - start_time).total_seconds() * 1000
+        duration = (perf_counter_ns() - start_ns) / 1e6
         
         print(f"搜索完成: {len(results)} 个结果, 耗时: {duration:.2f}ms")
         print("-" * 50)
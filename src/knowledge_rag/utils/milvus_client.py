@@ -6,7 +6,7 @@ KnowledgeRAG Milvus客户端工具
 
 import os
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 import numpy as np
 from datetime import datetime
@@ -24,6 +24,10 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# HNSW 搜索参数：ef = max(top_k * HNSW_EF_FACTOR, HNSW_EF_MIN)，须不小于 top_k
+HNSW_EF_FACTOR = 4
+HNSW_EF_MIN = 64
+
 @dataclass
 class SearchResult:
     """搜索结果数据类"""
@@ -51,7 +55,8 @@ class MilvusClient:
     
     def __init__(self, host: str = "localhost", port: int = 19530, 
                  collection_name: str = "rag_embeddings_v1", 
-                 vector_dim: int = 1536, alias: str = "default"):
+                 vector_dim: int = 1536, alias: str = "default",
+                 timeout: Optional[float] = None):
         """
         初始化Milvus客户端
         
@@ -61,6 +66,7 @@ class MilvusClient:
             collection_name: 集合名称
             vector_dim: 向量维度
             alias: 连接别名
+            timeout: 连接超时时间（秒），None 使用 pymilvus 默认值
         """
         if not MILVUS_AVAILABLE:
             raise ImportError("Milvus客户端依赖未安装")
@@ -70,6 +76,7 @@ class MilvusClient:
         self.collection_name = collection_name
         self.vector_dim = vector_dim
         self.alias = alias
+        self.timeout = timeout
         self.collection: Optional[Collection] = None
         
         self._connect()
@@ -83,10 +90,14 @@ class MilvusClient:
                 connections.disconnect(self.alias)
             
             # 创建连接
+            connect_kwargs = {}
+            if self.timeout is not None:
+                connect_kwargs['timeout'] = self.timeout
             connections.connect(
                 alias=self.alias,
                 host=self.host,
-                port=self.port
+                port=self.port,
+                **connect_kwargs
             )
             
             logger.info(f"成功连接到Milvus服务器: {self.host}:{self.port}")
@@ -290,19 +301,21 @@ class MilvusClient:
             logger.error(f"批量向量插入失败: {e}")
             raise
     
-    def search(self, query_vector: List[float], top_k: int = 10, 
+    def search(self, query_vector: Union[List[float], np.ndarray], top_k: int = 10, 
                user_id: Optional[int] = None, doc_uuid: Optional[str] = None,
-               version_label: Optional[str] = None, ts_range: Optional[Tuple[int, int]] = None) -> List[SearchResult]:
+               version_label: Optional[str] = None, ts_range: Optional[Tuple[int, int]] = None,
+               ef: Optional[int] = None) -> List[SearchResult]:
         """
         搜索相似向量
         
         Args:
-            query_vector: 查询向量
+            query_vector: 查询向量（列表或 float32 ndarray）
             top_k: 返回top k结果
             user_id: 用户ID过滤
             doc_uuid: 文档UUID过滤
             version_label: 版本标签过滤
             ts_range: 时间戳范围过滤 (start_ts, end_ts)
+            ef: HNSW 搜索候选数，None 时按 top_k 计算
             
         Returns:
             搜索结果列表
@@ -312,7 +325,7 @@ class MilvusClient:
             search_params = {
                 "metric_type": "COSINE",
                 "params": {
-                    "ef": 200
+                    "ef": ef if ef is not None else max(top_k * HNSW_EF_FACTOR, HNSW_EF_MIN)
                 }
             }
             
@@ -519,7 +532,8 @@ class MilvusClient:
 _milvus_client = None
 
 def get_milvus_client(host: str = None, port: int = None, 
-                     collection_name: str = None, vector_dim: int = None) -> MilvusClient:
+                     collection_name: str = None, vector_dim: int = None,
+                     timeout: float = None) -> MilvusClient:
     """
     获取全局Milvus客户端实例
     
@@ -528,6 +542,7 @@ def get_milvus_client(host: str = None, port: int = None,
         port: Milvus服务器端口
         collection_name: 集合名称
         vector_dim: 向量维度
+        timeout: 连接超时时间（秒）
         
     Returns:
         Milvus客户端实例
@@ -544,7 +559,8 @@ def get_milvus_client(host: str = None, port: int = None,
             'host': host or os.getenv('MILVUS_HOST', 'localhost'),
             'port': port or int(os.getenv('MILVUS_PORT', 19530)),
             'collection_name': collection_name or os.getenv('MILVUS_COLLECTION', 'rag_embeddings_v1'),
-            'vector_dim': vector_dim
+            'vector_dim': vector_dim,
+            'timeout': timeout
         }
         _milvus_client = MilvusClient(**config)
     return _milvus_client 
\ No newline at end of file
@@ -6,16 +6,21 @@ KnowledgeRAG MySQL客户端工具
 
 import os
 import logging
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, date
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
 from mysql.connector.pooling import MySQLConnectionPool
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# 连接池已满时等待空闲连接的最长时间（秒），超时仍抛出 PoolError
+POOL_CHECKOUT_TIMEOUT = 20
+
 @dataclass
 class ChunkIn:
     """Chunk输入数据类"""
@@ -99,6 +104,8 @@ class MySQLClient:
         }
         
         self.pool: Optional[MySQLConnectionPool] = None
+        # MySQLConnectionPool 为空时会立即抛出 PoolError，用信号量让并发调用方排队等待
+        self._pool_slots = threading.BoundedSemaphore(pool_size)
         self._initialize_pool()
     
     def _initialize_pool(self):
@@ -112,7 +119,11 @@ class MySQLClient:
     
     @contextmanager
     def get_connection(self):
-        """获取数据库连接上下文管理器"""
+        """获取数据库连接上下文管理器（连接池已满时等待，最多 POOL_CHECKOUT_TIMEOUT 秒）"""
+        if not self._pool_slots.acquire(timeout=POOL_CHECKOUT_TIMEOUT):
+            logger.error(f"MySQL连接池已耗尽，等待 {POOL_CHECKOUT_TIMEOUT} 秒仍无空闲连接")
+            raise PoolError("Failed getting connection; pool exhausted")
+        
         connection = None
         try:
             connection = self.pool.get_connection()
@@ -125,6 +136,7 @@ class MySQLClient:
         finally:
             if connection:
                 connection.close()
+            self._pool_slots.release()
     
     def create_document(self, user_id: int, title: str, mime_type: Optional[str] = None) -> int:
         """
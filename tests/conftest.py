@@ -0,0 +1,10 @@
+"""
+测试公共配置：将 src 与 db_server 加入导入路径
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'db_server'))
@@ -0,0 +1,156 @@
+"""
+config 模块测试（环境变量解析与 .env 读取）
+"""
+
+import os
+from dataclasses import fields
+
+import pytest
+
+from knowledge_rag.config import (
+    DatabaseSettings,
+    EmbeddingSettings,
+    KnowledgeRAGSettings,
+    LoggingSettings,
+    MilvusSettings,
+    ObjectStoreSettings,
+    RetrievalSettings,
+    SecuritySettings,
+    TokenBudgetSettings,
+    _load_env_file,
+)
+
+SETTINGS_CLASSES = (
+    DatabaseSettings, MilvusSettings, ObjectStoreSettings, EmbeddingSettings,
+    TokenBudgetSettings, LoggingSettings, RetrievalSettings, SecuritySettings, KnowledgeRAGSettings
+)
+
+
+@pytest.fixture
+def clean_environ(monkeypatch):
+    for key in ('ENV_A', 'ENV_B', 'ENV_C', 'ENV_D', 'ENV_E', 'ENV_F'):
+        monkeypatch.delenv(key, raising=False)
+    return monkeypatch
+
+
+def test_load_env_file_parsing(tmp_path, clean_environ):
+    env_file = tmp_path / '.env'
+    env_file.write_text(
+        '# comment\n'
+        '\n'
+        'ENV_A=plain\n'
+        'ENV_B="quoted value"  # trailing comment\n'
+        "ENV_C='has # hash'\n"
+        'ENV_D=104857600 # 100MB\n'
+        'export ENV_E=exported\n'
+        'not a pair\n',
+        encoding='utf-8'
+    )
+    _load_env_file(env_file)
+
+    assert os.environ['ENV_A'] == 'plain'
+    assert os.environ['ENV_B'] == 'quoted value'
+    assert os.environ['ENV_C'] == 'has # hash'
+    assert os.environ['ENV_D'] == '104857600'
+    assert os.environ['ENV_E'] == 'exported'
+
+
+def test_load_env_file_does_not_override(tmp_path, clean_environ):
+    clean_environ.setenv('ENV_F', 'from-shell')
+    env_file = tmp_path / '.env'
+    env_file.write_text('ENV_F=from-file\n', encoding='utf-8')
+    _load_env_file(env_file)
+    assert os.environ['ENV_F'] == 'from-shell'
+
+
+def test_from_env_casts_and_defaults():
+    settings = DatabaseSettings.from_env({'MYSQL_PORT': '3307', 'MYSQL_HOST': 'db'})
+    assert settings.port == 3307
+    assert settings.host == 'db'
+    assert settings.user == DatabaseSettings().user
+
+
+def test_from_env_bool_parsing():
+    assert KnowledgeRAGSettings.from_env({'DEBUG': 'off'}).debug is False
+    assert KnowledgeRAGSettings.from_env({'DEBUG': 'Yes'}).debug is True
+
+
+def test_from_env_builds_nested_settings():
+    settings = KnowledgeRAGSettings.from_env({'MILVUS_PORT': '1234', 'EMBEDDING_DIMENSION': '768'})
+    assert settings.milvus.port == 1234
+    assert settings.embedding.dimension == 768
+    assert KnowledgeRAGSettings().database == DatabaseSettings()
+
+
+def test_object_store_config_is_fresh_copy():
+    settings = KnowledgeRAGSettings()
+    config = settings.get_object_store_config()
+    config['base_path'] = '/elsewhere'
+    assert settings.get_object_store_config()['base_path'] == settings.object_store.base_path
+    assert settings.get_object_store_config() is not settings.get_object_store_config()
+
+
+@pytest.mark.parametrize('settings_cls', SETTINGS_CLASSES)
+def test_env_schema_matches_fields(settings_cls):
+    field_types = {f.name: f.type for f in fields(settings_cls)}
+    keys = [key for _, key, _ in settings_cls._ENV_SCHEMA]
+    assert len(keys) == len(set(keys))
+    for name, _, cast in settings_cls._ENV_SCHEMA:
+        assert name in field_types
+        # 类型表与字段注解一致（Optional[str] 按 str 读取）
+        assert cast.__name__ in str(field_types[name])
+
+
+@pytest.mark.parametrize('settings_cls', SETTINGS_CLASSES)
+def test_from_env_empty_mapping_uses_defaults(settings_cls):
+    assert settings_cls.from_env({}) == settings_cls()
+
+
+def test_from_env_reads_os_environ_by_default(monkeypatch):
+    monkeypatch.setenv('MILVUS_COLLECTION', 'from_environ')
+    monkeypatch.setenv('COMPRESSION_RATIO', '0.25')
+    assert MilvusSettings.from_env().collection_name == 'from_environ'
+    assert TokenBudgetSettings.from_env().compression_ratio == 0.25
+
+
+def test_from_env_rejects_invalid_int():
+    with pytest.raises(ValueError):
+        DatabaseSettings.from_env({'MYSQL_PORT': 'not-a-port'})
+
+
+@pytest.fixture
+def fresh_settings(monkeypatch):
+    """清空全局配置，测试结束后恢复"""
+    from knowledge_rag import config
+
+    monkeypatch.setenv('KNOWLEDGE_RAG_SKIP_VALIDATE', '1')
+    for name in ('_settings', 'db_settings', 'milvus_settings', 'object_store_settings', 'embedding_settings',
+                 'token_budget_settings', 'logging_settings', 'retrieval_settings', 'security_settings'):
+        monkeypatch.setattr(config, name, None)
+    return config
+
+
+def test_get_settings_fast_path_skips_lock(fresh_settings, monkeypatch):
+    config = fresh_settings
+    first = config.get_settings()
+    assert config.get_settings() is first
+
+    class _FailingLock:
+        def __enter__(self):
+            raise AssertionError("已构建的配置不应再加锁")
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(config, '_settings_lock', _FailingLock())
+    assert config.get_settings() is first
+
+
+def test_reload_settings_rebuilds(fresh_settings, monkeypatch):
+    config = fresh_settings
+    first = config.get_settings()
+    monkeypatch.setenv('MYSQL_PORT', '3310')
+    reloaded = config.reload_settings()
+    assert reloaded is not first
+    assert reloaded.database.port == 3310
+    assert config.get_settings() is reloaded
@@ -0,0 +1,202 @@
+"""
+experiment_data 批量创建/删除测试（不连接 MySQL / Milvus）
+"""
+
+import argparse
+import threading
+import time
+
+import pytest
+
+import experiment_data
+from experiment_data import UnifiedDataManager
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = UnifiedDataManager({})
+    # 只启用 Milvus 步骤，MySQL 与对象存储视为未连接
+    manager.services_status['milvus'] = True
+    monkeypatch.setattr(manager, '_create_experiment_config', lambda *args: None)
+    monkeypatch.setattr(manager, '_delete_experiment_config', lambda name: None)
+    return manager
+
+
+def test_create_bulk_uses_async_results_and_falls_back(manager, monkeypatch):
+    sync_calls = []
+    monkeypatch.setattr(manager, '_run_milvus_bulk', lambda operation, names: {'a': True, 'b': False})
+    monkeypatch.setattr(manager, '_create_milvus_collections', lambda name: sync_calls.append(name) or True)
+
+    results = manager.create_experiments_bulk(['a', 'b', 'c'])
+
+    assert {name: r['milvus'] for name, r in results.items()} == {'a': True, 'b': False, 'c': True}
+    # 只有异步批量未覆盖的实验走同步路径
+    assert sync_calls == ['c']
+
+
+def test_create_bulk_falls_back_to_sync_without_async_client(manager, monkeypatch):
+    monkeypatch.setattr(experiment_data, 'ASYNC_MILVUS_AVAILABLE', False)
+    sync_calls = []
+    monkeypatch.setattr(manager, '_create_milvus_collections', lambda name: sync_calls.append(name) or True)
+
+    results = manager.create_experiments_bulk(['a', 'b'])
+
+    assert sync_calls == ['a', 'b']
+    assert all(r['milvus'] for r in results.values())
+
+
+def test_delete_bulk_cancelled_without_confirmation(manager, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda prompt: 'n')
+    monkeypatch.setattr(manager, '_run_milvus_bulk', lambda *args: pytest.fail("不应执行删除"))
+    assert manager.delete_experiments_bulk(['a', 'b']) == {'cancelled': True}
+
+
+def test_delete_bulk_force(manager, monkeypatch):
+    monkeypatch.setattr(manager, '_run_milvus_bulk', lambda operation, names: {'a': True})
+    monkeypatch.setattr(manager, '_delete_milvus_collections', lambda name: False)
+
+    results = manager.delete_experiments_bulk(['a', 'b'], force=True)
+
+    assert results['a']['milvus'] is True
+    assert results['b']['milvus'] is False
+
+
+def _args(**overrides):
+    defaults = dict(experiment=None, researcher=None, description=None, template='basic_rag', force=True)
+    defaults.update(overrides)
+    return argparse.Namespace(**defaults)
+
+
+def test_cli_routes_comma_separated_names_to_bulk(manager, monkeypatch):
+    calls = []
+    monkeypatch.setattr(manager, 'create_experiments_bulk',
+                        lambda names, *rest: calls.append(('bulk', names)) or {name: {} for name in names})
+    monkeypatch.setattr(manager, 'create_experiment',
+                        lambda name, *rest: calls.append(('single', name)) or {})
+
+    assert experiment_data._handle_create_exp(manager, _args(experiment='a, b')) == 0
+    assert experiment_data._handle_create_exp(manager, _args(experiment='a')) == 0
+    assert calls == [('bulk', ['a', 'b']), ('single', 'a')]
+
+
+def test_cli_routes_bulk_delete(manager, monkeypatch):
+    calls = []
+    monkeypatch.setattr(manager, 'delete_experiments_bulk',
+                        lambda names, force: calls.append((names, force)) or {})
+
+    assert experiment_data._handle_delete_exp(manager, _args(experiment='a,b')) == 0
+    assert calls == [(['a', 'b'], True)]
+
+
+class _NativeMultiCursor:
+    """模拟 mysql-connector 9.2+ 游标：execute() 原生支持多语句"""
+
+    def __init__(self, pending_sets=0, max_allowed_packet=1 << 20):
+        self.executed = []
+        self.pending_sets = pending_sets
+        self.max_allowed_packet = max_allowed_packet
+
+    def execute(self, operation, params=None, map_results=False):
+        self.executed.append(operation)
+
+    def fetchone(self):
+        return (self.max_allowed_packet,)
+
+    def nextset(self):
+        if self.pending_sets:
+            self.pending_sets -= 1
+            return True
+        return None
+
+
+class _LegacyMultiCursor(_NativeMultiCursor):
+    """模拟 9.2 之前的游标：多语句需要 multi=True"""
+
+    def execute(self, operation, params=None, multi=False):
+        self.executed.append(operation)
+        return iter([None, None]) if multi else None
+
+
+SCHEMA_SQL = "CREATE TABLE a (id INT);\nCREATE TABLE b (id INT);\nCREATE TABLE c (id INT);"
+
+
+def test_schema_sql_native_multi_statement_sends_one_batch(manager):
+    cursor = _NativeMultiCursor(pending_sets=2)
+    manager._execute_schema_sql(cursor, SCHEMA_SQL)
+    assert cursor.executed == ["SELECT @@max_allowed_packet", SCHEMA_SQL]
+    # 后续语句的结果全部读完
+    assert cursor.pending_sets == 0
+
+
+def test_schema_sql_legacy_multi_statement(manager):
+    cursor = _LegacyMultiCursor()
+    manager._execute_schema_sql(cursor, SCHEMA_SQL)
+    assert cursor.executed == ["SELECT @@max_allowed_packet", SCHEMA_SQL]
+
+
+def test_schema_sql_split_into_batches_over_packet_limit(manager, monkeypatch):
+    monkeypatch.setattr(experiment_data, 'SCHEMA_STATEMENTS_PER_BATCH', 2)
+    cursor = _NativeMultiCursor(max_allowed_packet=16)
+    manager._execute_schema_sql(cursor, SCHEMA_SQL)
+    assert len(cursor.executed) == 3
+    assert cursor.executed[1].count('CREATE TABLE') == 2
+    assert cursor.executed[2].count('CREATE TABLE') == 1
+
+
+class _FakePool:
+    """模拟 MySQLConnectionPool：连接用尽时立即抛出异常"""
+
+    def __init__(self, pool_size, **config):
+        self.available = pool_size
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        with self.lock:
+            if self.available == 0:
+                raise RuntimeError("pool exhausted")
+            self.available -= 1
+        pool = self
+
+        class _Conn:
+            def close(self):
+                with pool.lock:
+                    pool.available += 1
+
+        return _Conn()
+
+
+def test_mysql_checkout_waits_instead_of_exhausting_pool(monkeypatch):
+    monkeypatch.setattr(experiment_data, 'MySQLConnectionPool', _FakePool)
+    manager = UnifiedDataManager({'mysql': {}})
+    errors = []
+
+    def worker():
+        try:
+            with manager._mysql():
+                time.sleep(0.01)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(experiment_data.MYSQL_POOL_SIZE * 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert manager._pool.available == experiment_data.MYSQL_POOL_SIZE
+
+
+def test_template_sql_uses_shared_schema_manager(monkeypatch):
+    import experiment_schemas
+
+    calls = []
+
+    class _Manager:
+        def generate_schema_sql(self, template):
+            calls.append(template)
+            return None
+
+    monkeypatch.setattr(experiment_schemas, 'get_manager', lambda: _Manager())
+    assert experiment_data._template_sql('missing') == ""
+    assert calls == ['missing']
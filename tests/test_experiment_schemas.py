@@ -0,0 +1,71 @@
+"""
+experiment_schemas 模板加载测试
+"""
+
+import os
+
+from experiment_schemas import ExperimentSchemaManager, _load_template_data
+
+TEMPLATE_YAML = """\
+name: custom
+description: 测试模板
+version: '1.0'
+created_at: 2024-01-02 03:04:05
+tables:
+  docs:
+    columns:
+    - name: id
+      type: BIGINT
+      primary_key: true
+    indexes: []
+    foreign_keys: []
+    labels:
+      1: first
+"""
+
+
+def _write_template(tmp_path):
+    path = tmp_path / "custom.yaml"
+    path.write_text(TEMPLATE_YAML, encoding='utf-8')
+    return path
+
+
+def test_yaml_and_sidecar_loads_agree(tmp_path):
+    path = _write_template(tmp_path)
+    mtime_ns = path.stat().st_mtime_ns
+    _load_template_data.cache_clear()
+    first = _load_template_data(str(path), mtime_ns)
+    assert path.with_suffix('.json').exists()
+
+    _load_template_data.cache_clear()
+    second = _load_template_data(str(path), mtime_ns)
+
+    assert first == second
+    assert isinstance(first['created_at'], str)
+    assert list(first['tables']['docs']['labels']) == ['1']
+
+
+def test_load_template_does_not_share_nested_columns(tmp_path):
+    _write_template(tmp_path)
+    manager = ExperimentSchemaManager(str(tmp_path))
+
+    template = manager.load_template('custom')
+    template.tables['docs']['columns'].append({"name": "extra", "type": "INT"})
+
+    reloaded = manager.load_template('custom')
+    assert [col['name'] for col in reloaded.tables['docs']['columns']] == ['id']
+
+
+def test_default_templates_have_no_yaml_aliases(tmp_path):
+    manager = ExperimentSchemaManager(str(tmp_path))
+    manager.ensure_defaults()
+
+    for path in tmp_path.glob("*.yaml"):
+        text = path.read_text(encoding='utf-8')
+        assert '&id' not in text and '*id' not in text, path.name
+
+    template = manager.load_template('basic_rag')
+    id_columns = [table['columns'][0] for table in template.tables.values()]
+    assert len(id_columns) > 1
+    id_columns[0]['type'] = 'INT'
+    assert all(col['type'] == 'BIGINT' for col in id_columns[1:])
@@ -0,0 +1,210 @@
+"""
+flexible_search 纯函数测试（无需 MySQL / Milvus）
+"""
+
+import logging
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+from mysql.connector.errors import PoolError
+
+from knowledge_rag.utils.flexible_search import (
+    SEARCH_WORKERS,
+    FlexibleSearchEngine,
+    SearchQuery,
+    SearchResult,
+    _QueryEmbeddingCache,
+    _get_search_executor,
+    _limit_custom_sql,
+    _reciprocal_rank_fusion,
+)
+
+
+class TestQueryEmbeddingCache:
+    def test_hit_ignores_case_and_whitespace(self):
+        cache = _QueryEmbeddingCache(db_path=None)
+        cache.put("How does RAG work", [1.0, 2.0], "m")
+        np.testing.assert_array_equal(cache.get("  how DOES rag\twork ", "m"), [1.0, 2.0])
+
+    def test_reordered_words_do_not_share_vectors(self):
+        cache = _QueryEmbeddingCache(db_path=None)
+        cache.put("man bites dog", [1.0, 0.0], "m")
+        assert cache.get("dog bites man", "m") is None
+
+    def test_single_word_difference_is_a_miss(self):
+        cache = _QueryEmbeddingCache(db_path=None)
+        words = [f"w{i}" for i in range(19)]
+        cache.put(" ".join(words + ["enable"]), [1.0], "m")
+        assert cache.get(" ".join(words + ["disable"]), "m") is None
+
+    def test_models_are_isolated(self):
+        cache = _QueryEmbeddingCache(db_path=None)
+        cache.put("query", [1.0], "model-a")
+        assert cache.get("query", "model-b") is None
+
+    def test_lru_eviction(self):
+        cache = _QueryEmbeddingCache(maxsize=2, db_path=None)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+        cache.put("c", [3.0])
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_persists_across_instances(self, tmp_path):
+        db_path = str(tmp_path / "cache.db")
+        _QueryEmbeddingCache(db_path=db_path).put("query", [0.5, 0.25], "m")
+        vector = _QueryEmbeddingCache(db_path=db_path).get("query", "m")
+        assert vector.dtype == np.float32
+        np.testing.assert_array_equal(vector, [0.5, 0.25])
+
+
+class TestLimitCustomSql:
+    def test_adds_limit_when_missing(self):
+        assert _limit_custom_sql("SELECT * FROM t", 5) == "SELECT * FROM t LIMIT 5"
+
+    def test_limit_not_swallowed_by_trailing_comment(self):
+        sql = _limit_custom_sql("SELECT * FROM t -- note", 5)
+        assert sql.endswith("LIMIT 5")
+
+    def test_keeps_smaller_limit(self):
+        assert _limit_custom_sql("SELECT a FROM t ORDER BY a LIMIT 3", 10).endswith("LIMIT 3")
+
+    def test_caps_larger_limit(self):
+        assert _limit_custom_sql("SELECT a FROM t LIMIT 1000", 10).endswith("LIMIT 10")
+
+    def test_union_is_allowed(self):
+        assert _limit_custom_sql("SELECT 1 UNION SELECT 2", 2).endswith("LIMIT 2")
+
+    @pytest.mark.parametrize("sql", [
+        "DELETE FROM t",
+        "WITH x AS (SELECT 1) DELETE FROM t",
+        "UPDATE t SET a = 1",
+        "SELECT 1; DROP TABLE t",
+        "DROP TABLE t",
+    ])
+    def test_rejects_non_select(self, sql):
+        with pytest.raises(ValueError):
+            _limit_custom_sql(sql, 10)
+
+
+def test_search_executor_is_shared():
+    assert _get_search_executor() is _get_search_executor()
+    assert _get_search_executor()._max_workers == SEARCH_WORKERS
+
+
+def _bare_engine(**attrs):
+    """不连接 MySQL / Milvus 的搜索引擎实例"""
+    engine = FlexibleSearchEngine.__new__(FlexibleSearchEngine)
+    engine.milvus_client = None
+    engine.default_table_mapping = {}
+    for name, value in attrs.items():
+        setattr(engine, name, value)
+    return engine
+
+
+class TestScoreBm25:
+    def test_empty_inputs(self):
+        assert FlexibleSearchEngine._score_bm25(None, "rag", []).shape == (0,)
+        np.testing.assert_array_equal(FlexibleSearchEngine._score_bm25(None, "", ["rag"]), [0.0])
+
+    def test_scores_are_raw_and_ranked(self):
+        contents = ["rag rag retrieval", "rag pipeline overview", "unrelated text here", "more filler words"]
+        scores = FlexibleSearchEngine._score_bm25(None, "RAG", contents)
+        assert scores[0] > scores[1] > 0
+        assert scores[2] == scores[3] == 0
+        # 不再按最高分归一化
+        assert scores.max() != pytest.approx(1.0)
+
+    def test_rare_term_outweighs_common_term(self):
+        contents = ["common rare", "common", "common", "common"]
+        scores = FlexibleSearchEngine._score_bm25(None, "common rare", contents)
+        assert scores[0] == scores.max()
+        assert scores[0] > 2 * scores[1]
+
+
+def test_keyword_search_merges_tables_by_rank():
+    # FULLTEXT 表与 BM25 表的分数量纲不同，按表内排名合并
+    per_table = {
+        'fulltext': [_result('1', 12.0, 'fulltext'), _result('2', 30.0, 'fulltext')],
+        'like': [_result('1', 0.4, 'like'), _result('9', 0.9, 'like')],
+    }
+    engine = _bare_engine(
+        _list_tables=lambda: ['fulltext', 'like'],
+        _search_in_table=lambda table, text, filters, top_k: list(per_table[table])
+    )
+    query = SearchQuery("q", query_type='keyword', top_k=4, table_mapping={'a': 'fulltext', 'b': 'like'})
+    results = engine._keyword_search(query)
+
+    # 各表第一名先于各表第二名，同一id在不同表中分别保留
+    assert [(r.source, r.id) for r in results] == [('fulltext', '2'), ('like', '9'), ('fulltext', '1'), ('like', '1')]
+    assert results[0].score == results[1].score == pytest.approx(1 / 61)
+    assert results[2].score == pytest.approx(1 / 62)
+
+
+def test_keyword_search_top_k_across_tables():
+    per_table = {
+        'strong': [_result(f's{i}', 100.0 - i, 'strong') for i in range(3)],
+        'weak': [_result('w0', 0.1, 'weak')],
+    }
+    engine = _bare_engine(
+        _list_tables=lambda: ['strong', 'weak'],
+        _search_in_table=lambda table, text, filters, top_k: list(per_table[table])
+    )
+    query = SearchQuery("q", query_type='keyword', top_k=2, table_mapping={'a': 'strong', 'b': 'weak'})
+    assert [r.id for r in engine._keyword_search(query)] == ['s0', 'w0']
+
+
+def _result(result_id, score, source):
+    return SearchResult(id=result_id, score=score, content=f"{source}:{result_id}", metadata={}, source=source)
+
+
+class TestReciprocalRankFusion:
+    def test_ranks_are_one_based(self):
+        assert _reciprocal_rank_fusion([["a", "b"]], k=60) == pytest.approx({"a": 1 / 61, "b": 1 / 62})
+
+    def test_scores_sum_across_lists(self):
+        scores = _reciprocal_rank_fusion([["a", "b"], ["b", "c"]], k=60)
+        assert scores["b"] == pytest.approx(1 / 62 + 1 / 61)
+        assert max(scores, key=scores.get) == "b"
+
+    def test_empty_lists(self):
+        assert _reciprocal_rank_fusion([[], []]) == {}
+
+
+class TestHybridSearch:
+    def _engine(self, semantic, keyword, milvus=True):
+        return _bare_engine(
+            milvus_client=object() if milvus else None,
+            _semantic_search=lambda query: semantic,
+            _keyword_search=lambda query: keyword
+        )
+
+    def test_fuses_by_rank_and_ignores_score_scale(self):
+        semantic = [_result("a", 0.9, "milvus"), _result("b", 0.8, "milvus")]
+        keyword = [_result("b", 50.0, "docs"), _result("c", 40.0, "docs")]
+        results = self._engine(semantic, keyword)._hybrid_search(SearchQuery("q", top_k=3))
+
+        assert [r.id for r in results] == ["b", "a", "c"]
+        assert results[0].score == pytest.approx(1 / 62 + 1 / 61)
+        # 同一id保留语义结果的内容
+        assert results[0].source == "milvus"
+
+    def test_top_k_and_serial_fallback(self):
+        keyword = [_result(str(i), 1.0, "docs") for i in range(5)]
+        results = self._engine([], keyword, milvus=False)._hybrid_search(SearchQuery("q", top_k=2))
+        assert [r.id for r in results] == ["0", "1"]
+
+
+def test_search_in_table_logs_pool_exhaustion(caplog):
+    class _ExhaustedClient:
+        @contextmanager
+        def get_connection(self):
+            raise PoolError("Failed getting connection; pool exhausted")
+            yield
+
+    engine = _bare_engine(mysql_client=_ExhaustedClient())
+    with caplog.at_level(logging.ERROR):
+        assert engine._search_in_table('docs', 'q', None, 5) == []
+    assert '连接池已耗尽' in caplog.text
@@ -0,0 +1,74 @@
+"""
+mysql_client 连接池借出测试（不连接 MySQL）
+"""
+
+import threading
+import time
+
+import pytest
+from mysql.connector.errors import PoolError
+
+from knowledge_rag.utils import mysql_client
+from knowledge_rag.utils.mysql_client import MySQLClient
+
+
+class _FakePool:
+    """模拟 MySQLConnectionPool：连接用尽时立即抛出 PoolError"""
+
+    def __init__(self, size):
+        self.available = size
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        with self.lock:
+            if self.available == 0:
+                raise PoolError("Failed getting connection; pool exhausted")
+            self.available -= 1
+        pool = self
+
+        class _Conn:
+            def close(self):
+                with pool.lock:
+                    pool.available += 1
+
+        return _Conn()
+
+
+def _client(pool_size):
+    client = MySQLClient.__new__(MySQLClient)
+    client.pool = _FakePool(pool_size)
+    client._pool_slots = threading.BoundedSemaphore(pool_size)
+    return client
+
+
+def test_concurrent_checkouts_wait_for_free_connection():
+    client = _client(2)
+    errors = []
+
+    def worker():
+        try:
+            with client.get_connection():
+                time.sleep(0.01)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert client.pool.available == 2
+
+
+def test_checkout_times_out_with_pool_error(monkeypatch):
+    monkeypatch.setattr(mysql_client, 'POOL_CHECKOUT_TIMEOUT', 0.01)
+    client = _client(1)
+    with client.get_connection():
+        with pytest.raises(PoolError):
+            with client.get_connection():
+                pass
+    # 超时的调用不占用名额，连接归还后可再次借出
+    with client.get_connection():
+        pass
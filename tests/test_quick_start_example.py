@@ -0,0 +1,34 @@
+"""
+quick_start_example 文本分块测试（无需 MySQL）
+"""
+
+from quick_start_example import QuickStartRAG
+
+
+def _chunk(content):
+    demo = QuickStartRAG.__new__(QuickStartRAG)
+    demo.mysql_client = None
+    return demo.process_text_chunks(content, doc_uuid='doc')
+
+
+def test_whitespace_only_separator_and_empty_paragraphs():
+    first = "第一段 " + "a " * 30
+    second = "第二段 " + "b " * 30
+    third = "第三段 " + "c " * 30
+    content = f"{first}\n   \t\n{second}\n\n\n\n{third}\n"
+
+    chunks = _chunk(content)
+
+    assert [chunk.text for chunk in chunks] == [first.strip(), second.strip(), third.strip()]
+    # 过滤空段落后序号仍连续
+    assert [chunk.seq_no for chunk in chunks] == [0, 1, 2]
+
+
+def test_short_paragraphs_are_dropped_and_seq_no_stays_contiguous():
+    long_text = "x " * 40
+    chunks = _chunk(f"short\n\n{long_text}\n\ntiny\n\n{long_text}")
+
+    assert len(chunks) == 2
+    assert [chunk.seq_no for chunk in chunks] == [0, 1]
+    assert chunks[0].token_count == 40
+    assert len({chunk.chunk_uid for chunk in chunks}) == 2